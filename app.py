@@ -1,15 +1,19 @@
 import db
-from matching import calc_match_score
+import writer
+import recommend
+from matching import render_reason
+from streaming import make_llm
+from ui import stream_structuring
+from prompts import DEV_PROMPT, PROJECT_PROMPT
 import json
+import queue
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import streamlit as st
 #import pandas as pd
 import numpy as np
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from langchain_openai import OpenAIEmbeddings
 from langchain_core.runnables import RunnablePassthrough, RunnableParallel
-from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv # .env 파일의 환경변수를 자동으로 불러오기 위한 모듈
 
 load_dotenv()  # 실행 시 .env 파일을 찾아 변수들을 환경에 로드
@@ -20,53 +24,19 @@ load_dotenv()  # 실행 시 .env 파일을 찾아 변수들을 환경에 로드
 # 설정
 # ----------------------------
 st.set_page_config(page_title="Dev↔Project Matching (SQLite)", layout="wide")
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+llm = make_llm()  # 스트리밍 LLM (FAKE_LLM=1 이면 오프라인 가짜 LLM)
+
+RECOMMEND_POLL_SECONDS = 0.3  # 추천 계산 중 화면 갱신 간격
 
 # schema.sql 읽기(파일로 저장해둔 DDL)
 SCHEMA_SQL = open("schema.sql", "r", encoding="utf-8").read()
 
-# ----------------------------
-# 프롬프트
-# ----------------------------
-DEV_PROMPT = ChatPromptTemplate.from_template("""
-너는 개발자 커리어를 구조화하는 AI다.
-반드시 JSON만 출력해라. 마크다운/설명 문장 금지.
-
-형식:
-{{
-  "name": "",
-  "role": "backend|frontend|fullstack|etc",
-  "total_career_years": number,
-  "headline": "",
-  "skills": [
-    {{"name":"", "type":"language|framework|db|tool|etc", "level":1~5, "experience_years": number, "is_primary":0|1}}
-  ]
-}}
-
-입력:
-{input}
-""")
-
-PROJECT_PROMPT = ChatPromptTemplate.from_template("""
-너는 기업 프로젝트를 구조화하는 AI다.
-반드시 JSON만 출력해라. 마크다운/설명 문장 금지.
-
-형식:
-{{
-  "company_name": "",
-  "industry": "",
-  "project_name": "",
-  "description": "",
-  "min_total_career": number,
-  "requirements": [
-    {{"skill":"", "type":"language|framework|db|tool|etc",
-     "min_level":1~5, "min_years": number, "weight":1~5, "mandatory":true|false}}
-  ]
-}}
-
-입력:
-{input}
-""")
+@st.cache_resource
+def ensure_schema():
+    """프로세스 시작 시 한 번 스키마/마이그레이션 적용(예전 matching.db 도 바로 쓸 수 있게)"""
+    db.init_db(SCHEMA_SQL)
+
+ensure_schema()
 
 # ----------------------------
 # 세션 상태
@@ -75,6 +45,8 @@ st.session_state.setdefault("chat_msgs", [])  # [{"role":"user|assistant","conte
 st.session_state.setdefault("mode", "개발자 등록")
 st.session_state.setdefault("last_saved_dev_id", None)
 st.session_state.setdefault("last_saved_project_id", None)
+st.session_state.setdefault("recommend_jobs", {})  # {project_id: RecommendationJob} 계산 중인 작업 고정
+st.session_state.setdefault("pending_saves", [])  # [(Future, 설명)] 결과를 기다리지 않은 matches 저장
 
 # ----------------------------
 # 사이드바
@@ -114,6 +86,49 @@ def push_msg(role: str, content: str):
 def pretty_json(obj) -> str:
     return json.dumps(obj, indent=2, ensure_ascii=False)
 
+SAVE_PENDING_MSG = ("⏳ 저장이 아직 끝나지 않았습니다. 요청은 계속 처리 중이니 다시 입력하지 말고 "
+                    "잠시 후 저장 결과를 확인해주세요.")
+
+def submit_and_wait(op, *args):
+    """
+    쓰기 큐에 넣고 커밋될 때까지 기다린다. (결과, None) 또는 실패 시 (None, 안내 메시지).
+    시간 초과는 요청이 아직 큐에서 처리 중이라는 뜻이므로 다시 제출하라고 안내하지 않는다(중복 등록 방지).
+    """
+    try:
+        return writer.submit(op, *args).result(timeout=writer.RESULT_TIMEOUT), None
+    except FutureTimeoutError:
+        return None, SAVE_PENDING_MSG
+    except queue.Full:
+        return None, "❌ 저장 요청이 밀려 있어 접수하지 못했습니다. 잠시 후 다시 시도해주세요."
+    except Exception as e:  # writer 중단(RuntimeError) 또는 DB 오류
+        return None, f"❌ 저장 실패: {e}"
+
+def save_matches_async(project_id: int, rows, description: str) -> bool:
+    """matches 저장을 쓰기 큐에만 넣고, 결과는 다음 rerun 에서 report_pending_saves 로 확인한다."""
+    try:
+        fut = writer.submit(db.write_matches, project_id, rows)
+    except queue.Full:
+        st.error(f"{description} 실패: 저장 요청이 밀려 있습니다. 잠시 후 다시 시도해주세요.")
+        return False
+    except RuntimeError as e:
+        st.error(f"{description} 실패: {e}")
+        return False
+    fut.add_done_callback(writer.log_failure(description))
+    st.session_state.pending_saves.append((fut, description))
+    return True
+
+def report_pending_saves():
+    """끝난 저장 요청의 성공/실패를 보여주고, 아직 진행 중인 것만 남긴다."""
+    pending = []
+    for fut, description in st.session_state.pending_saves:
+        if not fut.done():
+            pending.append((fut, description))
+        elif fut.exception() is not None:
+            st.error(f"{description} 실패: {fut.exception()}")
+        else:
+            st.toast(f"{description} 완료")
+    st.session_state.pending_saves = pending
+
 # ----------------------------
 # 공용: 점수 UI
 # ----------------------------
@@ -158,39 +173,40 @@ if st.session_state.mode in ["개발자 등록", "기업/프로젝트 등록"]:
         push_msg("user", user_text)
 
         if st.session_state.mode == "개발자 등록":
-            res = (DEV_PROMPT | llm).invoke({"input": user_text})
+            with st.chat_message("assistant"):
+                raw = stream_structuring(DEV_PROMPT | llm, user_text, "skills", "name", "level")
             try:
-                data = json.loads(res.content)
-                dev_id = db.create_developer(
-                    name=data["name"],
-                    role=data.get("role", "etc"),
-                    total_career_years=float(data.get("total_career_years", 0)),
-                    headline=data.get("headline"),
+                data = json.loads(raw)
+                args = (
+                    data["name"],
+                    data.get("role", "etc"),
+                    float(data.get("total_career_years", 0)),
+                    data.get("headline"),
+                    data.get("skills", []),
                 )
-                db.save_developer_skills(dev_id, data.get("skills", []))
-                st.session_state.last_saved_dev_id = dev_id
-
-                push_msg("assistant",
-                         "✅ 개발자 프로필 저장 완료!\n\n"
-                         f"- developer_id = `{dev_id}`\n\n"
-                         "구조화 결과(JSON):\n```json\n" + pretty_json(data) + "\n```")
             except Exception:
+                data = None
                 push_msg("assistant",
                          "❌ JSON 파싱 실패. 입력을 더 명확히 해주세요.\n\n"
-                         "AI 원본 응답:\n```\n" + res.content + "\n```")
+                         "AI 원본 응답:\n```\n" + raw + "\n```")
+
+            if data is not None:
+                # 개발자 + 기술을 한 트랜잭션으로 쓰기 큐에 넣고 생성된 id 를 기다린다
+                dev_id, error = submit_and_wait(db.insert_developer_profile, *args)
+                if error:
+                    push_msg("assistant", error)
+                else:
+                    st.session_state.last_saved_dev_id = dev_id
+                    push_msg("assistant",
+                             "✅ 개발자 프로필 저장 완료!\n\n"
+                             f"- developer_id = `{dev_id}`\n\n"
+                             "구조화 결과(JSON):\n```json\n" + pretty_json(data) + "\n```")
 
         else:  # 기업/프로젝트 등록
-            res = (PROJECT_PROMPT | llm).invoke({"input": user_text})
+            with st.chat_message("assistant"):
+                raw = stream_structuring(PROJECT_PROMPT | llm, user_text, "requirements", "skill", "min_level")
             try:
-                data = json.loads(res.content)
-
-                company_id = db.create_company(data["company_name"], data.get("industry"))
-                project_id = db.create_project(
-                    company_id=company_id,
-                    project_name=data["project_name"],
-                    description=data.get("description", ""),
-                    min_total_career=float(data.get("min_total_career", 0)),
-                )
+                data = json.loads(raw)
 
                 reqs = []
                 for r in data.get("requirements", []):
@@ -202,18 +218,32 @@ if st.session_state.mode in ["개발자 등록", "기업/프로젝트 등록"]:
                         "weight": int(r.get("weight", 1)),
                         "mandatory": 1 if bool(r.get("mandatory", True)) else 0,
                     })
-
-                db.save_project_requirements(project_id, reqs)
-                st.session_state.last_saved_project_id = project_id
-
-                push_msg("assistant",
-                         "✅ 프로젝트 저장 완료!\n\n"
-                         f"- project_id = `{project_id}`\n\n"
-                         "구조화 결과(JSON):\n```json\n" + pretty_json(data) + "\n```")
+                args = (
+                    data["company_name"],
+                    data.get("industry"),
+                    data["project_name"],
+                    data.get("description", ""),
+                    float(data.get("min_total_career", 0)),
+                    reqs,
+                )
             except Exception:
+                data = None
                 push_msg("assistant",
                          "❌ JSON 파싱 실패. 입력을 더 명확히 해주세요.\n\n"
-                         "AI 원본 응답:\n```\n" + res.content + "\n```")
+                         "AI 원본 응답:\n```\n" + raw + "\n```")
+
+            if data is not None:
+                # 기업 + 프로젝트 + 요구 기술을 한 트랜잭션으로 쓰기 큐에 넣고 생성된 id 를 기다린다
+                saved, error = submit_and_wait(db.insert_project_profile, *args)
+                if error:
+                    push_msg("assistant", error)
+                else:
+                    _, project_id = saved
+                    st.session_state.last_saved_project_id = project_id
+                    push_msg("assistant",
+                             "✅ 프로젝트 저장 완료!\n\n"
+                             f"- project_id = `{project_id}`\n\n"
+                             "구조화 결과(JSON):\n```json\n" + pretty_json(data) + "\n```")
 
         st.rerun()
 
@@ -225,26 +255,26 @@ if st.session_state.mode in ["개발자 등록", "기업/프로젝트 등록"]:
 
 if st.session_state.mode == "매칭 추천":
     projects = db.list_open_projects()
-    devs = db.list_developers()
 
-    if not projects or not devs:
+    if not projects or db.count_developers() == 0:
         st.info("먼저 개발자와 프로젝트를 등록하세요.")
     else:
         # Row → dict 변환
-        projects = [dict(r) for r in db.list_open_projects()]
+        projects = [dict(r) for r in projects]
         proj = st.selectbox(
             "프로젝트 선택",
             options=projects,
             format_func=lambda r: f"[{r['project_id']}] {r['company_name']} - {r['project_name']}"
         )
 
-        top_n = st.slider("추천 인원 수", 1, 20, 5)
+        top_n = st.slider("추천 인원 수", 1, recommend.MAX_TOP_N, 5)
 
         # requirements 로드
         req_rows = db.get_project_requirements(int(proj["project_id"]))
         reqs = [dict(r) for r in req_rows]
 
         project_dict = {"min_total_career": float(proj["min_total_career"])}
+        skill_names = {r["skill_id"]: r["skill_name"] for r in reqs}
 
         st.markdown("### 요구 기술")
         if reqs:
@@ -264,49 +294,70 @@ if st.session_state.mode == "매칭 추천":
         st.divider()
         st.markdown("### 추천 결과")
 
-        results = []
-        for d in devs:
-            dev_id = int(d["developer_id"])
-            dev_skill_rows = db.get_developer_skills(dev_id)
-            dev_skills = [dict(s) for s in dev_skill_rows]
-
-            dev_dict = {
-                "total_career_years": float(d["total_career_years"]),
-                "role": d["role"],
-            }
-
-            score, reason = calc_match_score(dev_dict, project_dict, dev_skills, reqs)
-            if score > 0:
-                results.append((score, dev_id, d["name"], d["role"], reason, dev_skills))
-
-        results.sort(key=lambda x: x[0], reverse=True)
-        results = results[:top_n]
-
-        if not results:
-            st.warning("필수 조건을 만족하는 개발자가 없습니다.")
-        else:
-            for score, dev_id, name, role, reason, dev_skills in results:
-                with st.container(border=True):
-                    st.markdown(f"#### ✅ {name} ({role}) — **{score}점**")
-                    score_bar(score)
-
-                    with st.expander("매칭 상세 이유"):
-                        st.text(reason)
-
-                    with st.expander("개발자 기술 목록"):
-                        st.dataframe(
-                            [{
-                                "skill": s["skill_name"],
-                                "level": s["skill_level"],
-                                "years": s["experience_years"],
-                                "primary": "Y" if s["is_primary"] == 1 else "N"
-                            } for s in dev_skills],
-                            use_container_width=True
-                        )
-
-                    if st.button(f"💾 matches에 저장 (dev_id={dev_id})", key=f"save_{proj['project_id']}_{dev_id}"):
-                        db.save_match(int(proj["project_id"]), dev_id, score, reason)
-                        st.success("저장 완료!")
+        # 순위 계산은 (project_id, 데이터 버전) 별 백그라운드 작업으로 실행한다.
+        # 같은 키면 이미 계산된(또는 계산 중인) 결과를 재사용하므로 top_n 만 바꿔도 재계산하지 않는다.
+        # 계산 중에는 세션에 고정한 작업을 계속 보여주고(폴링마다 데이터 버전을 다시 읽지 않음),
+        # 끝난 뒤에야 최신 데이터 버전과 비교해서 필요하면 새로 계산한다.
+        project_id = int(proj["project_id"])
+        job = st.session_state.recommend_jobs.get(project_id)
+        data_version = None if job is None or not job.done else db.get_data_version()
+        if job is None or job.cancelled or job.error is not None or (job.done and job.data_version != data_version):
+            job = recommend.get_job(project_id, db.get_data_version(), project_dict, reqs)
+            st.session_state.recommend_jobs[project_id] = job
+
+        # 계산 중에는 결과/진행률 부분만 RECOMMEND_POLL_SECONDS 마다 다시 그린다.
+        # (페이지 전체를 rerun 하지 않으므로 프로젝트 목록/요구 기술 조회, 사이드바는 다시 실행되지 않는다)
+        polling = not job.done
+
+        @st.fragment(run_every=RECOMMEND_POLL_SECONDS if polling else None)
+        def show_recommendations():
+            if polling and job.done:
+                st.rerun()  # 계산이 끝나면 전체를 한 번 다시 그려서 폴링을 멈추고 저장 버튼을 보여준다
+            report_pending_saves()
+            results = job.top(top_n)
+
+            if job.error is not None:
+                st.error(f"추천 계산 중 오류가 발생했습니다: {job.error}")
+            elif not job.done:
+                st.progress(job.progress(), text=f"추천 계산 중... ({job.scanned}/{job.total}명 확인, 중간 결과)")
+
+            if not results:
+                if job.done:
+                    st.warning("필수 조건을 만족하는 개발자가 없습니다.")
+            else:
+                if job.done and st.button(f"💾 TOP {len(results)} 전체 matches에 저장", key=f"save_all_{proj['project_id']}"):
+                    # 렌더링을 막지 않도록 쓰기 큐에만 넣고 결과는 다음 rerun 에서 확인한다
+                    if save_matches_async(
+                        int(proj["project_id"]),
+                        [(dev_id, score, breakdown) for score, dev_id, _, _, breakdown, _ in results],
+                        f"TOP {len(results)} matches 저장",
+                    ):
+                        st.success(f"{len(results)}건 저장 요청 완료!")
+
+                for score, dev_id, name, role, breakdown, dev_skills in results:
+                    with st.container(border=True):
+                        st.markdown(f"#### ✅ {name} ({role}) — **{score}점**")
+                        score_bar(score)
+
+                        with st.expander("매칭 상세 이유"):
+                            st.text(render_reason(breakdown, skill_names, dev_skills, reqs))
+
+                        with st.expander("개발자 기술 목록"):
+                            st.dataframe(
+                                [{
+                                    "skill": s["skill_name"],
+                                    "level": s["skill_level"],
+                                    "years": s["experience_years"],
+                                    "primary": "Y" if s["is_primary"] == 1 else "N"
+                                } for s in dev_skills],
+                                use_container_width=True
+                            )
+
+                        if job.done and st.button(f"💾 matches에 저장 (dev_id={dev_id})", key=f"save_{proj['project_id']}_{dev_id}"):
+                            if save_matches_async(int(proj["project_id"]), [(dev_id, score, breakdown)], f"matches 저장 (dev_id={dev_id})"):
+                                st.success("저장 요청 완료!")
+
+        show_recommendations()
 
 # ----------------------------
 # 저장된 매칭 조회 화면
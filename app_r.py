@@ -3,9 +3,12 @@ import streamlit as st
 from dotenv import load_dotenv
 
 import db
-from matching import calc_match_score
+import writer
+from matching import get_scorer, render_reason
+from streaming import make_llm, stream_text
+from ui import stream_structuring
 
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_openai import OpenAIEmbeddings
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_community.vectorstores import FAISS
 
@@ -23,7 +26,7 @@ st.title("💬 LangChain + RAG 기반 개발자-프로젝트 매칭")
 # -------------------------------------------------
 # LLM / Embeddings
 # -------------------------------------------------
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+llm = make_llm()  # 스트리밍 LLM (FAKE_LLM=1 이면 오프라인 가짜 LLM)
 embeddings = OpenAIEmbeddings()
 
 # -------------------------------------------------
@@ -31,6 +34,13 @@ embeddings = OpenAIEmbeddings()
 # -------------------------------------------------
 SCHEMA_SQL = open("schema.sql", "r", encoding="utf-8").read()
 
+@st.cache_resource
+def ensure_schema():
+    # 프로세스 시작 시 한 번 스키마/마이그레이션 적용
+    db.init_db(SCHEMA_SQL)
+
+ensure_schema()
+
 # -------------------------------------------------
 # Prompt Templates
 # -------------------------------------------------
@@ -154,16 +164,17 @@ if st.session_state.mode == "개발자 등록":
     text = st.text_area("개발자 커리어를 자연어로 입력하세요")
 
     if st.button("분석 & 저장"):
-        res = (DEV_PROMPT | llm).invoke({"input": text})
-        data = json.loads(res.content)
-
-        dev_id = db.create_developer(
-            name=data["name"],
-            role=data["role"],
-            total_career_years=data["total_career_years"],
-            headline=data.get("headline")
-        )
-        db.save_developer_skills(dev_id, data["skills"])
+        raw = stream_structuring(DEV_PROMPT | llm, text, "skills", "name", "level", keep_preview=False)
+        data = json.loads(raw)
+
+        dev_id = writer.submit(
+            db.insert_developer_profile,
+            data["name"],
+            data["role"],
+            data["total_career_years"],
+            data.get("headline"),
+            data["skills"]
+        ).result(timeout=writer.RESULT_TIMEOUT)
         st.success(f"저장 완료 (developer_id={dev_id})")
         st.json(data)
 
@@ -175,16 +186,8 @@ elif st.session_state.mode == "기업/프로젝트 등록":
     text = st.text_area("프로젝트 요구사항을 자연어로 입력하세요")
 
     if st.button("분석 & 저장"):
-        res = (PROJECT_PROMPT | llm).invoke({"input": text})
-        data = json.loads(res.content)
-
-        company_id = db.create_company(data["company_name"], data.get("industry"))
-        project_id = db.create_project(
-            company_id,
-            data["project_name"],
-            data.get("description", ""),
-            data["min_total_career"]
-        )
+        raw = stream_structuring(PROJECT_PROMPT | llm, text, "requirements", "skill", "min_level", keep_preview=False)
+        data = json.loads(raw)
 
         reqs = []
         for r in data["requirements"]:
@@ -197,7 +200,15 @@ elif st.session_state.mode == "기업/프로젝트 등록":
                 "mandatory": 1 if r["mandatory"] else 0
             })
 
-        db.save_project_requirements(project_id, reqs)
+        _, project_id = writer.submit(
+            db.insert_project_profile,
+            data["company_name"],
+            data.get("industry"),
+            data["project_name"],
+            data.get("description", ""),
+            data["min_total_career"],
+            reqs
+        ).result(timeout=writer.RESULT_TIMEOUT)
         st.success(f"저장 완료 (project_id={project_id})")
         st.json(data)
 
@@ -224,9 +235,9 @@ else:
     project_dict = {"min_total_career": proj["min_total_career"]}
 
     # -------- RAG: Vector Index 생성 --------
-    docs, metas = [], []
+    docs, metas, dev_skills = [], [], {}
     for d in devs:
-        skills = [dict(s) for s in db.get_developer_skills(d["developer_id"])]
+        skills = dev_skills[d["developer_id"]] = [dict(s) for s in db.get_developer_skills(d["developer_id"])]
         docs.append(dev_to_text(d, skills))
         metas.append({"developer_id": d["developer_id"], "name": d["name"]})
 
@@ -237,22 +248,21 @@ else:
     rag_context = "\n\n".join(d.page_content for d in rag_docs)
 
     # -------- Rule 기반 점수 --------
+    # 요구 기술은 스코어러로 한 번만 해석하고, 상세 텍스트는 화면에 보일 TOP 5 만 만든다
+    scorer = get_scorer(proj["project_id"], project_dict, reqs, db.get_skill_holder_counts)
+    skill_names = {r["skill_id"]: r["skill_name"] for r in reqs}
     results = []
     for d in devs:
-        skills = [dict(s) for s in db.get_developer_skills(d["developer_id"])]
-        score, reason = calc_match_score(
-            {"total_career_years": d["total_career_years"], "role": d["role"]},
-            project_dict,
-            skills,
-            reqs
-        )
+        skills = dev_skills[d["developer_id"]]
+        score, breakdown = scorer.score(d, skills)
         if score > 0:
-            results.append((score, d, reason, skills))
+            results.append((score, d, breakdown, skills))
 
     results.sort(key=lambda x: x[0], reverse=True)
 
     # -------- 출력 --------
-    for score, d, reason, skills in results[:5]:
+    for score, d, breakdown, skills in results[:5]:
+        reason = render_reason(breakdown, skill_names, skills, reqs)
         with st.container(border=True):
             st.markdown(f"### ✅ {d['name']} ({d['role']})")
             score_bar(score)
@@ -261,11 +271,11 @@ else:
                 st.text(reason)
 
             with st.expander("🧠 RAG 기반 설명"):
-                rag_res = (RAG_EXPLAIN_PROMPT | llm).invoke({
+                # 토큰이 도착하는 대로 화면에 출력
+                st.write_stream(stream_text(RAG_EXPLAIN_PROMPT | llm, {
                     "project_text": project_text,
                     "rag_context": rag_context
-                })
-                st.markdown(rag_res.content)
+                }))
 
             with st.expander("🧩 기술 스택"):
                 st.json(skills)
@@ -0,0 +1,177 @@
+"""
+db.py 조회 쿼리의 실행 계획 회귀 검사.
+
+    python check_query_plans.py [--developers 20000] [--analyze]
+
+임시 DB 에 schema.sql 을 적용하고 합성 데이터를 채운 뒤, db.py 의 조회 함수를 실제로 호출하면서
+실행된 SELECT 문을 추적해 EXPLAIN QUERY PLAN 을 확인한다.
+인덱스 없는 전체 스캔(SCAN <table>)이나 정렬용 임시 B-tree(USE TEMP B-TREE)가 나오면 실패(exit 1).
+"""
+import argparse
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+from typing import Callable, Dict, List, Set, Tuple
+
+import db
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+
+# 인덱스 없이 스캔해도 되는 테이블(별칭) — 전체를 id 순으로 훑는 것이 목적인 쿼리
+ALLOWED_SCANS: Dict[str, Set[str]] = {
+    "iter_developers_with_skills": {"d"},  # 개발자 풀 전체
+    "iter_ranked_matches": {"p"},          # 필터 없는 전체 내보내기: 프로젝트 순으로 훑고 matches 는 인덱스 탐색
+    "iter_ranked_matches(top_k)": {"p"},   # 프로젝트 목록을 훑고 프로젝트마다 인덱스에서 LIMIT top_k
+}
+
+_BAD_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+def populate(conn: sqlite3.Connection, n_developers: int, seed: int = 42) -> None:
+    rnd = random.Random(seed)
+    n_skills = 300
+    n_companies = max(10, n_developers // 100)
+    n_projects = max(20, n_developers // 10)
+
+    conn.executemany(
+        "INSERT INTO skills(skill_id, skill_name, skill_type) VALUES (?, ?, 'etc')",
+        [(i, f"skill{i}") for i in range(1, n_skills + 1)]
+    )
+    conn.executemany(
+        "INSERT INTO companies(company_id, company_name, created_at) VALUES (?, ?, datetime('now', ?))",
+        [(i, f"company{i}", f"-{i} minutes") for i in range(1, n_companies + 1)]
+    )
+    conn.executemany(
+        "INSERT INTO developers(developer_id, name, role, total_career_years, created_at) VALUES (?, ?, ?, ?, datetime('now', ?))",
+        [
+            (i, f"dev{i}", rnd.choice(["backend", "frontend", "fullstack"]), rnd.randint(0, 20), f"-{i} minutes")
+            for i in range(1, n_developers + 1)
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO developer_skills(developer_id, skill_id, skill_level, experience_years) VALUES (?, ?, ?, ?)",
+        [
+            (d, s, rnd.randint(1, 5), rnd.randint(0, 10))
+            for d in range(1, n_developers + 1)
+            for s in rnd.sample(range(1, n_skills + 1), 6)
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO projects(project_id, company_id, project_name, min_total_career, status, created_at) "
+        "VALUES (?, ?, ?, ?, ?, datetime('now', ?))",
+        [
+            (i, rnd.randint(1, n_companies), f"project{i}", rnd.randint(0, 5),
+             "OPEN" if rnd.random() < 0.2 else "CLOSED", f"-{i} minutes")
+            for i in range(1, n_projects + 1)
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO project_requirements(project_id, skill_id, min_skill_level, min_experience_years, weight, is_mandatory) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (p, s, rnd.randint(1, 5), rnd.randint(0, 5), rnd.randint(1, 5), rnd.randint(0, 1))
+            for p in range(1, n_projects + 1)
+            for s in rnd.sample(range(1, n_skills + 1), 4)
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO matches(project_id, developer_id, match_score, breakdown, created_at) VALUES (?, ?, ?, '[]', datetime('now', ?))",
+        [
+            (p, d, rnd.randint(1, 100), f"-{p * 10 + d} seconds")
+            for p in range(1, n_projects + 1)
+            for d in rnd.sample(range(1, n_developers + 1), 10)
+        ]
+    )
+
+def db_calls() -> List[Tuple[str, Callable[[], object]]]:
+    """검사할 db.py 조회 함수 호출 목록 (새 조회 함수를 추가하면 여기에도 추가)"""
+    return [
+        ("list_open_projects", db.list_open_projects),
+        ("list_developers", db.list_developers),
+        ("count_developers", db.count_developers),
+        ("get_data_version", db.get_data_version),
+        ("get_project_requirements", lambda: db.get_project_requirements(1)),
+        ("get_developer_skills", lambda: db.get_developer_skills(1)),
+        ("list_matches", db.list_matches),
+        ("get_match_detail", lambda: db.get_match_detail(1)),
+        ("get_skill_holder_counts", lambda: db.get_skill_holder_counts([1, 2, 3])),
+        ("get_skill_names", lambda: db.get_skill_names([1, 2, 3])),
+        ("get_known_resume_hashes", lambda: db.get_known_resume_hashes(["a" * 64, "b" * 64])),
+        ("iter_developers_with_skills", lambda: next(db.iter_developers_with_skills())),
+        ("iter_ranked_matches", lambda: next(db.iter_ranked_matches())),
+        ("iter_ranked_matches(project)", lambda: next(db.iter_ranked_matches(project_id=1, top_k=5))),
+        ("iter_ranked_matches(company)", lambda: next(db.iter_ranked_matches(company_id=1, min_score=50))),
+        ("iter_ranked_matches(top_k)", lambda: next(db.iter_ranked_matches(top_k=3))),
+        ("iter_ranked_matches(company, top_k)", lambda: next(db.iter_ranked_matches(company_id=1, top_k=3))),
+    ]
+
+def trace_selects(call: Callable[[], object]) -> List[str]:
+    """call 을 실행하는 동안 db.get_conn 으로 실행된 SELECT 문(바인딩 값 포함)을 모은다."""
+    statements: List[str] = []
+    original = db.get_conn
+
+    def traced_conn() -> sqlite3.Connection:
+        conn = original()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    db.get_conn = traced_conn
+    try:
+        call()
+    finally:
+        db.get_conn = original
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+def plan_problems(conn: sqlite3.Connection, sql: str, allowed_scans: Set[str]) -> Tuple[List[str], List[str]]:
+    plan = [r["detail"] for r in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+    problems = []
+    for detail in plan:
+        if "USE TEMP B-TREE" in detail:
+            problems.append(detail)
+        m = _BAD_SCAN.match(detail)
+        if m and m.group(1) not in allowed_scans:
+            problems.append(detail)
+    return plan, problems
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="db.py 조회 쿼리 실행 계획 회귀 검사")
+    parser.add_argument("--developers", type=int, default=20000, help="합성 개발자 수")
+    parser.add_argument("--analyze", action="store_true", help="ANALYZE 통계를 만든 뒤 검사")
+    parser.add_argument("-v", "--verbose", action="store_true", help="통과한 쿼리의 실행 계획도 출력")
+    args = parser.parse_args(argv)
+
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        schema_sql = f.read()
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp:
+        db.DB_PATH = os.path.join(tmp, "plans.db")
+        db.init_db(schema_sql)
+        with db.get_conn() as conn:
+            populate(conn, args.developers)
+            if args.analyze:
+                conn.execute("ANALYZE")
+
+        failed = 0
+        with db.get_conn() as conn:
+            for name, call in db_calls():
+                for sql in trace_selects(call):
+                    plan, problems = plan_problems(conn, sql, ALLOWED_SCANS.get(name, set()))
+                    status = "FAIL" if problems else "ok"
+                    if problems or args.verbose:
+                        print(f"[{status}] {name}")
+                        for detail in plan:
+                            print(f"    {detail}")
+                    if problems:
+                        failed += 1
+                        print("    → " + "; ".join(problems))
+
+    if failed:
+        print(f"{failed}개 쿼리에서 전체 스캔/임시 정렬이 발견되었습니다.")
+        return 1
+    print("모든 쿼리가 인덱스를 사용합니다.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
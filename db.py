@@ -1,17 +1,97 @@
+import re
 import sqlite3
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from matching import (
+    Breakdown, FAIL_CAREER, FAIL_MANDATORY_LEVEL, FAIL_MANDATORY_MISSING, FAIL_MANDATORY_YEARS,
+    FAIL_NONE, FAIL_OPTIONAL_MISSING, decode_breakdown, encode_breakdown, render_reason,
+)
 
 DB_PATH = "matching.db"
+UPSERT_SKILLS_CHUNK = 400
+BUSY_TIMEOUT_MS = 5000
+FETCH_CHUNK = 1000
+IN_CHUNK = 500  # IN (...) 바인딩 변수 개수 제한용
 
 def get_conn() -> sqlite3.Connection:
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};")
     return conn
 
 def init_db(schema_sql: str) -> None:
     with get_conn() as conn:
         conn.executescript(schema_sql)
+        migrate_db(conn)
+
+# ----------------------------
+# 마이그레이션
+# ----------------------------
+_LEGACY_SCORED = re.compile(r"^- (.+?): 레벨 .+?\(([\d.]+)\), 연차 .+?\(([\d.]+)\), 가중치 (\d+)$")
+_LEGACY_OPTIONAL = re.compile(r"^- (.+?): 보유하지 않음\(선택\)$")
+_LEGACY_REJECTED = [
+    (re.compile(r"^필수 기술\((.+)\)이 없습니다\.$"), FAIL_MANDATORY_MISSING),
+    (re.compile(r"^필수 기술\((.+)\) 숙련도 부족\.$"), FAIL_MANDATORY_LEVEL),
+    (re.compile(r"^필수 기술\((.+)\) 사용 연차 부족\.$"), FAIL_MANDATORY_YEARS),
+]
+
+def _parse_legacy_reason(reason: str, skill_ids: Dict[str, int], weights: Dict[int, int]) -> Breakdown:
+    """
+    예전 matches.reason 텍스트를 breakdown 으로 변환한다.
+    skills 에서 지워진 기술은 skill_id=None 으로 남겨서 탈락 사유/충족률이 사라지지 않게 한다.
+    """
+    text = reason.strip()
+    if text.startswith("전체 경력이"):
+        return [[None, 0.0, 0.0, 0, FAIL_CAREER]]
+    for pattern, code in _LEGACY_REJECTED:
+        m = pattern.match(text)
+        if m:
+            skill_id = skill_ids.get(m.group(1))
+            return [[skill_id, 0.0, 0.0, weights.get(skill_id, 1), code]]
+
+    breakdown = []
+    for line in text.splitlines():
+        m = _LEGACY_SCORED.match(line)
+        if m:
+            breakdown.append([skill_ids.get(m.group(1)), float(m.group(2)), float(m.group(3)), int(m.group(4)), FAIL_NONE])
+            continue
+        m = _LEGACY_OPTIONAL.match(line)
+        if m:
+            skill_id = skill_ids.get(m.group(1))
+            breakdown.append([skill_id, 0.0, 0.0, weights.get(skill_id, 1), FAIL_OPTIONAL_MISSING])
+    return breakdown
+
+def migrate_db(conn: sqlite3.Connection) -> None:
+    """
+    matches.reason(텍스트) → matches.breakdown(JSON) 변환.
+    기존 행을 변환한 뒤 reason 컬럼을 삭제한다(DROP COLUMN 미지원 SQLite 에서는 NULL 로 비운다).
+    """
+    columns = {r["name"] for r in conn.execute("PRAGMA table_info(matches)")}
+    if "reason" not in columns:
+        return
+    if "breakdown" not in columns:
+        conn.execute("ALTER TABLE matches ADD COLUMN breakdown TEXT")
+
+    skill_ids = {r["skill_name"]: int(r["skill_id"]) for r in conn.execute("SELECT skill_id, skill_name FROM skills")}
+    # 프로젝트별 {skill_id: weight} (match 행마다가 아니라 프로젝트마다 한 번만 조회)
+    weights: Dict[int, Dict[int, int]] = {}
+    for r in conn.execute("SELECT project_id, skill_id, weight FROM project_requirements"):
+        weights.setdefault(int(r["project_id"]), {})[int(r["skill_id"])] = int(r["weight"])
+
+    rows = conn.execute(
+        "SELECT match_id, project_id, reason FROM matches WHERE reason IS NOT NULL AND breakdown IS NULL"
+    ).fetchall()
+    updates = [
+        (encode_breakdown(_parse_legacy_reason(row["reason"], skill_ids, weights.get(row["project_id"], {}))), row["match_id"])
+        for row in rows
+    ]
+    conn.executemany("UPDATE matches SET breakdown=? WHERE match_id=?", updates)
+
+    try:
+        conn.execute("ALTER TABLE matches DROP COLUMN reason")
+    except sqlite3.OperationalError:
+        conn.execute("UPDATE matches SET reason=NULL")
 
 def upsert_skill(conn: sqlite3.Connection, name: str, skill_type: str = "etc") -> int:
     cur = conn.execute(
@@ -23,6 +103,194 @@ def upsert_skill(conn: sqlite3.Connection, name: str, skill_type: str = "etc") -
     row = cur.fetchone()
     return int(row["skill_id"])
 
+def upsert_skills(conn: sqlite3.Connection, skills: List[Tuple[str, str]]) -> Dict[str, int]:
+    """
+    여러 기술을 한 번의 INSERT ... RETURNING 으로 등록하고 {skill_name: skill_id} 를 돌려준다.
+    skills 예: [("Java", "language"), ("Oracle", "db"), ...]
+    같은 이름이 여러 번 오면 upsert_skill 을 순서대로 호출한 것처럼 마지막 type 이 남는다.
+    """
+    merged: Dict[str, str] = {}
+    for name, skill_type in skills:
+        merged[name.strip()] = skill_type.strip()
+
+    items = list(merged.items())
+    skill_ids: Dict[str, int] = {}
+    # 바인딩 변수 한도(구버전 SQLite 999개)를 넘지 않도록 나눠서 실행
+    for i in range(0, len(items), UPSERT_SKILLS_CHUNK):
+        chunk = items[i:i + UPSERT_SKILLS_CHUNK]
+        values = ", ".join(["(?, ?)"] * len(chunk))
+        rows = conn.execute(
+            f"INSERT INTO skills(skill_name, skill_type) VALUES {values} "
+            "ON CONFLICT(skill_name) DO UPDATE SET skill_type=excluded.skill_type "
+            "RETURNING skill_id, skill_name;",
+            [v for pair in chunk for v in pair]
+        ).fetchall()
+        skill_ids.update({r["skill_name"]: int(r["skill_id"]) for r in rows})
+    return skill_ids
+
+# ----------------------------
+# 쓰기 연산(conn 단위)
+# 커밋하지 않고 주어진 conn 에서만 실행하므로
+# writer.DBWriter 가 여러 연산을 하나의 트랜잭션으로 묶을 수 있다.
+# ----------------------------
+def insert_developer(
+    conn: sqlite3.Connection,
+    name: str,
+    role: str,
+    total_career_years: float,
+    headline: Optional[str] = None,
+) -> int:
+    cur = conn.execute(
+        "INSERT INTO developers(name, role, total_career_years, headline) VALUES (?, ?, ?, ?)",
+        (name, role, total_career_years, headline)
+    )
+    return int(cur.lastrowid)
+
+def write_developer_skills(
+    conn: sqlite3.Connection,
+    developer_id: int,
+    skills: List[Dict[str, Any]],
+    skill_ids: Optional[Dict[str, int]] = None,
+) -> None:
+    """skill_ids 를 넘기면(upsert_skills 결과) 기술 등록을 건너뛴다."""
+    if skill_ids is None:
+        skill_ids = upsert_skills(conn, [(s["name"], s.get("type", "etc")) for s in skills])
+    conn.executemany(
+        """
+        INSERT INTO developer_skills(developer_id, skill_id, skill_level, experience_years, last_used_at, is_primary)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(developer_id, skill_id) DO UPDATE SET
+          skill_level=excluded.skill_level,
+          experience_years=excluded.experience_years,
+          last_used_at=excluded.last_used_at,
+          is_primary=excluded.is_primary
+        """,
+        [
+            (
+                developer_id,
+                skill_ids[s["name"].strip()],
+                int(s.get("level", 3)),
+                float(s.get("experience_years", 0)),
+                s.get("last_used_at"),
+                int(s.get("is_primary", 0))
+            )
+            for s in skills
+        ]
+    )
+
+def insert_developer_profile(
+    conn: sqlite3.Connection,
+    name: str,
+    role: str,
+    total_career_years: float,
+    headline: Optional[str],
+    skills: List[Dict[str, Any]],
+) -> int:
+    developer_id = insert_developer(conn, name, role, total_career_years, headline)
+    write_developer_skills(conn, developer_id, skills)
+    return developer_id
+
+def insert_resume_profiles(conn: sqlite3.Connection, resumes: List[Tuple[str, str, Dict[str, Any]]]) -> List[int]:
+    """
+    이력서에서 구조화한 개발자 프로필 여러 건을 한 번에 저장하고 resume_files 에 처리 이력을 남긴다.
+    resumes 예: [(content_hash, file_name, {"name":..., "role":..., "total_career_years":..., "headline":..., "skills":[...]}), ...]
+    묶음 전체의 기술 이름은 upsert_skills 한 번으로 등록한다.
+    """
+    skill_ids = upsert_skills(
+        conn,
+        [(s["name"], s.get("type", "etc")) for _, _, p in resumes for s in p.get("skills", [])]
+    )
+    developer_ids = []
+    for _, _, p in resumes:
+        developer_id = insert_developer(
+            conn, p["name"], p.get("role", "etc"), float(p.get("total_career_years", 0)), p.get("headline")
+        )
+        write_developer_skills(conn, developer_id, p.get("skills", []), skill_ids)
+        developer_ids.append(developer_id)
+    conn.executemany(
+        "INSERT OR REPLACE INTO resume_files(content_hash, developer_id, file_name) VALUES (?, ?, ?)",
+        [(content_hash, developer_id, file_name) for (content_hash, file_name, _), developer_id in zip(resumes, developer_ids)]
+    )
+    return developer_ids
+
+def insert_company(conn: sqlite3.Connection, company_name: str, industry: Optional[str] = None) -> int:
+    cur = conn.execute(
+        "INSERT INTO companies(company_name, industry) VALUES (?, ?)",
+        (company_name, industry)
+    )
+    return int(cur.lastrowid)
+
+def insert_project(
+    conn: sqlite3.Connection,
+    company_id: int,
+    project_name: str,
+    description: str,
+    min_total_career: float,
+) -> int:
+    cur = conn.execute(
+        "INSERT INTO projects(company_id, project_name, description, min_total_career) VALUES (?, ?, ?, ?)",
+        (company_id, project_name, description, min_total_career)
+    )
+    return int(cur.lastrowid)
+
+def write_project_requirements(conn: sqlite3.Connection, project_id: int, reqs: List[Dict[str, Any]]) -> None:
+    skill_ids = upsert_skills(conn, [(r["skill"], r.get("type", "etc")) for r in reqs])
+    conn.executemany(
+        """
+        INSERT INTO project_requirements(project_id, skill_id, min_skill_level, min_experience_years, weight, is_mandatory)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(project_id, skill_id) DO UPDATE SET
+          min_skill_level=excluded.min_skill_level,
+          min_experience_years=excluded.min_experience_years,
+          weight=excluded.weight,
+          is_mandatory=excluded.is_mandatory
+        """,
+        [
+            (
+                project_id,
+                skill_ids[r["skill"].strip()],
+                int(r.get("min_level", 3)),
+                float(r.get("min_years", 0)),
+                int(r.get("weight", 1)),
+                int(r.get("mandatory", 1)),
+            )
+            for r in reqs
+        ]
+    )
+
+def insert_project_profile(
+    conn: sqlite3.Connection,
+    company_name: str,
+    industry: Optional[str],
+    project_name: str,
+    description: str,
+    min_total_career: float,
+    reqs: List[Dict[str, Any]],
+) -> Tuple[int, int]:
+    company_id = insert_company(conn, company_name, industry)
+    project_id = insert_project(conn, company_id, project_name, description, min_total_career)
+    write_project_requirements(conn, project_id, reqs)
+    return company_id, project_id
+
+def write_matches(conn: sqlite3.Connection, project_id: int, matches: List[Tuple[int, int, Breakdown]]) -> None:
+    conn.executemany(
+        """
+        INSERT INTO matches(project_id, developer_id, match_score, breakdown)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(project_id, developer_id) DO UPDATE SET
+          match_score=excluded.match_score,
+          breakdown=excluded.breakdown,
+          created_at=datetime('now')
+        """,
+        [
+            (project_id, developer_id, int(score), encode_breakdown(breakdown))
+            for developer_id, score, breakdown in matches
+        ]
+    )
+
+# ----------------------------
+# 쓰기 API(호출마다 커밋)
+# ----------------------------
 def create_developer(
     name: str,
     role: str,
@@ -30,11 +298,7 @@ def create_developer(
     headline: Optional[str] = None,
 ) -> int:
     with get_conn() as conn:
-        cur = conn.execute(
-            "INSERT INTO developers(name, role, total_career_years, headline) VALUES (?, ?, ?, ?)",
-            (name, role, total_career_years, headline)
-        )
-        return int(cur.lastrowid)
+        return insert_developer(conn, name, role, total_career_years, headline)
 
 def save_developer_skills(developer_id: int, skills: List[Dict[str, Any]]) -> None:
     """
@@ -42,35 +306,11 @@ def save_developer_skills(developer_id: int, skills: List[Dict[str, Any]]) -> No
     [{"name":"Java","level":5,"experience_years":4,"type":"language","is_primary":1}, ...]
     """
     with get_conn() as conn:
-        for s in skills:
-            skill_id = upsert_skill(conn, s["name"], s.get("type", "etc"))
-            conn.execute(
-                """
-                INSERT INTO developer_skills(developer_id, skill_id, skill_level, experience_years, last_used_at, is_primary)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(developer_id, skill_id) DO UPDATE SET
-                  skill_level=excluded.skill_level,
-                  experience_years=excluded.experience_years,
-                  last_used_at=excluded.last_used_at,
-                  is_primary=excluded.is_primary
-                """,
-                (
-                    developer_id,
-                    skill_id,
-                    int(s.get("level", 3)),
-                    float(s.get("experience_years", 0)),
-                    s.get("last_used_at"),
-                    int(s.get("is_primary", 0))
-                )
-            )
+        write_developer_skills(conn, developer_id, skills)
 
 def create_company(company_name: str, industry: Optional[str] = None) -> int:
     with get_conn() as conn:
-        cur = conn.execute(
-            "INSERT INTO companies(company_name, industry) VALUES (?, ?)",
-            (company_name, industry)
-        )
-        return int(cur.lastrowid)
+        return insert_company(conn, company_name, industry)
 
 def create_project(
     company_id: int,
@@ -79,11 +319,7 @@ def create_project(
     min_total_career: float,
 ) -> int:
     with get_conn() as conn:
-        cur = conn.execute(
-            "INSERT INTO projects(company_id, project_name, description, min_total_career) VALUES (?, ?, ?, ?)",
-            (company_id, project_name, description, min_total_career)
-        )
-        return int(cur.lastrowid)
+        return insert_project(conn, company_id, project_name, description, min_total_career)
 
 def save_project_requirements(project_id: int, reqs: List[Dict[str, Any]]) -> None:
     """
@@ -91,27 +327,19 @@ def save_project_requirements(project_id: int, reqs: List[Dict[str, Any]]) -> No
     [{"skill":"Java","min_level":4,"min_years":3,"weight":5,"mandatory":1,"type":"language"}, ...]
     """
     with get_conn() as conn:
-        for r in reqs:
-            skill_id = upsert_skill(conn, r["skill"], r.get("type", "etc"))
-            conn.execute(
-                """
-                INSERT INTO project_requirements(project_id, skill_id, min_skill_level, min_experience_years, weight, is_mandatory)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(project_id, skill_id) DO UPDATE SET
-                  min_skill_level=excluded.min_skill_level,
-                  min_experience_years=excluded.min_experience_years,
-                  weight=excluded.weight,
-                  is_mandatory=excluded.is_mandatory
-                """,
-                (
-                    project_id,
-                    skill_id,
-                    int(r.get("min_level", 3)),
-                    float(r.get("min_years", 0)),
-                    int(r.get("weight", 1)),
-                    int(r.get("mandatory", 1)),
-                )
-            )
+        write_project_requirements(conn, project_id, reqs)
+
+def save_match(project_id: int, developer_id: int, score: int, breakdown: Breakdown) -> None:
+    with get_conn() as conn:
+        write_matches(conn, project_id, [(developer_id, score, breakdown)])
+
+def save_matches(project_id: int, matches: List[Tuple[int, int, Breakdown]]) -> None:
+    """
+    한 프로젝트의 추천 결과를 하나의 트랜잭션으로 저장한다.
+    matches 예: [(developer_id, score, breakdown), ...]
+    """
+    with get_conn() as conn:
+        write_matches(conn, project_id, matches)
 
 def list_open_projects() -> List[sqlite3.Row]:
     with get_conn() as conn:
@@ -119,6 +347,22 @@ def list_open_projects() -> List[sqlite3.Row]:
             "SELECT p.*, c.company_name FROM projects p JOIN companies c ON p.company_id=c.company_id WHERE p.status='OPEN' ORDER BY p.created_at DESC"
         ).fetchall()
 
+def count_developers() -> int:
+    with get_conn() as conn:
+        return int(conn.execute("SELECT COUNT(*) FROM developers").fetchone()[0])
+
+def get_data_version() -> int:
+    """
+    개발자/기술/요구 기술이 바뀔 때마다 증가하는 값(schema.sql 의 data_version 트리거).
+    스키마를 아직 적용하지 않은 DB 라면 0.
+    """
+    with get_conn() as conn:
+        try:
+            row = conn.execute("SELECT version FROM data_version WHERE id=1").fetchone()
+        except sqlite3.OperationalError:
+            return 0
+        return int(row["version"]) if row else 0
+
 def list_developers() -> List[sqlite3.Row]:
     with get_conn() as conn:
         return conn.execute(
@@ -149,21 +393,6 @@ def get_developer_skills(developer_id: int) -> List[sqlite3.Row]:
             (developer_id,)
         ).fetchall()
 
-def save_match(project_id: int, developer_id: int, score: int, reason: str) -> None:
-    with get_conn() as conn:
-        conn.execute(
-            """
-            INSERT INTO matches(project_id, developer_id, match_score, reason)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(project_id, developer_id) DO UPDATE SET
-              match_score=excluded.match_score,
-              reason=excluded.reason,
-              created_at=datetime('now')
-            """,
-            (project_id, developer_id, int(score), reason)
-        )
-
-
 def list_matches():
     with get_conn() as conn:
         return conn.execute(
@@ -179,11 +408,201 @@ def list_matches():
             """
         ).fetchall()
 
+def iter_developers_with_skills(chunk_size: int = FETCH_CHUNK) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    (developer, skills) 를 developer_id 순으로 하나씩 돌려준다.
+    fetchmany 로 chunk_size 행씩만 읽으므로 개발자 수와 관계없이 메모리 사용량이 일정하다.
+    """
+    with get_conn() as conn:
+        cur = conn.execute(
+            """
+            SELECT d.developer_id, d.name, d.role, d.total_career_years,
+                   ds.skill_id, s.skill_name, ds.skill_level, ds.experience_years, ds.is_primary
+            FROM developers d
+            LEFT JOIN developer_skills ds ON ds.developer_id=d.developer_id
+            LEFT JOIN skills s ON s.skill_id=ds.skill_id
+            ORDER BY d.developer_id
+            """
+        )
+        dev, skills = None, []
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            for r in rows:
+                if dev is None or dev["developer_id"] != r["developer_id"]:
+                    if dev is not None:
+                        yield dev, skills
+                    dev = {
+                        "developer_id": r["developer_id"],
+                        "name": r["name"],
+                        "role": r["role"],
+                        "total_career_years": r["total_career_years"],
+                    }
+                    skills = []
+                if r["skill_id"] is not None:
+                    skills.append({
+                        "skill_id": r["skill_id"],
+                        "skill_name": r["skill_name"],
+                        "skill_level": r["skill_level"],
+                        "experience_years": r["experience_years"],
+                        "is_primary": r["is_primary"],
+                    })
+        if dev is not None:
+            yield dev, skills
+
+def iter_ranked_matches(
+    project_id: Optional[int] = None,
+    company_id: Optional[int] = None,
+    min_score: int = 0,
+    top_k: Optional[int] = None,
+    chunk_size: int = FETCH_CHUNK,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    저장된 matches 를 프로젝트별 점수 순위(rank)와 함께 chunk_size 행씩 돌려준다.
+    idx_match_project_score 순서대로 읽으면서 순위를 매기므로 정렬용 임시 테이블이 필요 없다.
+    같은 점수는 developer_id 가 작은 쪽이 앞 순위(matching.rank_key 와 동일).
+
+    top_k 가 없으면 조건에 맞는 matches 를 한 번의 쿼리로 모두 읽는다.
+    top_k 가 있으면 프로젝트마다 인덱스에서 상위 top_k 행만 LIMIT 으로 읽으므로
+    프로젝트당 matches 수와 관계없이 (프로젝트 수 × top_k) 행만 읽는다.
+    """
+    if top_k is not None:
+        yield from _iter_top_k_matches(project_id, company_id, min_score, top_k, chunk_size)
+        return
+
+    where, params = ["m.match_score >= ?"], [min_score]
+    if project_id is not None:
+        where.append("m.project_id=?")
+        params.append(project_id)
+    if company_id is not None:
+        where.append("p.company_id=?")
+        params.append(company_id)
+
+    with get_conn() as conn:
+        cur = conn.execute(
+            f"""
+            SELECT m.project_id, p.project_name, p.company_id, c.company_name,
+                   m.developer_id, d.name AS developer_name, m.match_score
+            FROM matches m
+            JOIN projects p ON m.project_id=p.project_id
+            JOIN companies c ON p.company_id=c.company_id
+            JOIN developers d ON m.developer_id=d.developer_id
+            WHERE {" AND ".join(where)}
+            ORDER BY p.project_id, m.match_score DESC, m.developer_id
+            """,
+            params
+        )
+        current_project, rank = None, 0
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            chunk = []
+            for r in rows:
+                if r["project_id"] != current_project:
+                    current_project, rank = r["project_id"], 0
+                rank += 1
+                chunk.append({**dict(r), "rank": rank})
+            yield chunk
+
+def _iter_top_k_matches(
+    project_id: Optional[int],
+    company_id: Optional[int],
+    min_score: int,
+    top_k: int,
+    chunk_size: int,
+) -> Iterator[List[Dict[str, Any]]]:
+    where, params = [], []
+    if project_id is not None:
+        where.append("p.project_id=?")
+        params.append(project_id)
+    if company_id is not None:
+        where.append("p.company_id=?")
+        params.append(company_id)
+
+    with get_conn() as conn:
+        projects = conn.execute(
+            f"""
+            SELECT p.project_id, p.project_name, p.company_id, c.company_name
+            FROM projects p
+            JOIN companies c ON p.company_id=c.company_id
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY p.project_id
+            """,
+            params
+        ).fetchall()
+
+        chunk: List[Dict[str, Any]] = []
+        for p in projects:
+            rows = conn.execute(
+                """
+                SELECT m.developer_id, d.name AS developer_name, m.match_score
+                FROM matches m
+                JOIN developers d ON m.developer_id=d.developer_id
+                WHERE m.project_id=? AND m.match_score >= ?
+                ORDER BY m.match_score DESC, m.developer_id
+                LIMIT ?
+                """,
+                (p["project_id"], min_score, top_k)
+            ).fetchall()
+            for rank, r in enumerate(rows, start=1):
+                chunk.append({**dict(p), **dict(r), "rank": rank})
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+def get_skill_holder_counts(skill_ids: List[int]) -> Dict[int, int]:
+    """{skill_id: 해당 기술을 보유한 개발자 수} (matching.get_scorer 의 필수 조건 검사 순서용)"""
+    ids = list(set(skill_ids))
+    if not ids:
+        return {}
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"SELECT skill_id, COUNT(*) AS cnt FROM developer_skills WHERE skill_id IN ({', '.join(['?'] * len(ids))}) GROUP BY skill_id",
+            ids
+        ).fetchall()
+        return {int(r["skill_id"]): int(r["cnt"]) for r in rows}
+
+def get_known_resume_hashes(content_hashes: List[str]) -> Set[str]:
+    """이미 처리한 이력서 파일의 content_hash 만 골라서 돌려준다."""
+    hashes = list(set(content_hashes))
+    known: Set[str] = set()
+    with get_conn() as conn:
+        for i in range(0, len(hashes), IN_CHUNK):
+            chunk = hashes[i:i + IN_CHUNK]
+            rows = conn.execute(
+                f"SELECT content_hash FROM resume_files WHERE content_hash IN ({', '.join(['?'] * len(chunk))})",
+                chunk
+            ).fetchall()
+            known.update(r["content_hash"] for r in rows)
+    return known
+
+def get_skill_names(skill_ids: List[int]) -> Dict[int, str]:
+    ids = [i for i in set(skill_ids) if i is not None]
+    if not ids:
+        return {}
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"SELECT skill_id, skill_name FROM skills WHERE skill_id IN ({', '.join(['?'] * len(ids))})",
+            ids
+        ).fetchall()
+        return {int(r["skill_id"]): r["skill_name"] for r in rows}
+
 def get_match_detail(match_id: int):
+    """저장된 breakdown 을 풀고, 조회 시점에 reason 텍스트를 만들어 함께 돌려준다."""
     with get_conn() as conn:
         row = conn.execute(
             "SELECT * FROM matches WHERE match_id=?",
             (match_id,)
         ).fetchone()
-        return dict(row) if row else None
+    if not row:
+        return None
+    detail = dict(row)
+    breakdown = decode_breakdown(detail.get("breakdown"))
+    detail["breakdown"] = breakdown
+    detail["reason"] = render_reason(breakdown, get_skill_names([b[0] for b in breakdown]))
+    return detail
             
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+추천 결과(프로젝트별 top-k 개발자) 리포트 내보내기.
+
+    python export.py --out matches.csv
+    python export.py --out matches.parquet --format parquet --source compute --top-k 20 --min-score 70
+
+--source matches : 저장된 matches 테이블 기준
+--source compute : OPEN 프로젝트 전체에 대해 개발자 풀을 한 번 훑으며 즉석 계산
+어느 쪽이든 chunk 단위 generator 로 읽고 쓰므로 결과 크기와 관계없이 메모리 사용량이 일정하다.
+"""
+import argparse
+import csv
+import heapq
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+import db
+from matching import get_scorer, rank_key, skill_map
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # parquet 출력은 pyarrow 가 설치된 경우에만 지원
+    pa = None
+    pq = None
+
+COLUMNS = [
+    "project_id", "project_name", "company_id", "company_name",
+    "rank", "developer_id", "developer_name", "match_score",
+]
+DEFAULT_TOP_K = 10
+
+def iter_saved_rows(
+    project_id: Optional[int],
+    company_id: Optional[int],
+    min_score: int,
+    top_k: Optional[int],
+    chunk_size: int,
+) -> Iterator[List[Dict[str, Any]]]:
+    for rows in db.iter_ranked_matches(project_id, company_id, min_score, top_k, chunk_size):
+        yield [{c: r[c] for c in COLUMNS} for r in rows]
+
+def iter_computed_rows(
+    project_id: Optional[int],
+    company_id: Optional[int],
+    min_score: int,
+    top_k: int,
+    chunk_size: int,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    개발자 풀을 한 번만 훑으면서 프로젝트마다 크기 top_k 의 힙을 유지한다.
+    메모리는 (프로젝트 수 × top_k) 에만 비례한다.
+    """
+    projects = [
+        dict(p) for p in db.list_open_projects()
+        if (project_id is None or p["project_id"] == project_id)
+        and (company_id is None or p["company_id"] == company_id)
+    ]
+    scorers = {}
+    for p in projects:
+        reqs = [dict(r) for r in db.get_project_requirements(p["project_id"])]
+        scorers[p["project_id"]] = get_scorer(p["project_id"], p, reqs, db.get_skill_holder_counts)
+    heaps: Dict[int, list] = {p["project_id"]: [] for p in projects}
+
+    for dev, skills in db.iter_developers_with_skills(chunk_size):
+        dev_map = skill_map(skills)  # 프로젝트마다가 아니라 개발자마다 한 번
+        for pid, scorer in scorers.items():
+            score, _ = scorer.score(dev, skills, dev_map)
+            if score <= 0 or score < min_score:
+                continue
+            # 같은 점수의 순위는 추천 화면/저장된 matches 와 같은 rank_key 로 정한다
+            item = (rank_key(score, dev["developer_id"]), dev["developer_id"], dev["name"])
+            heap = heaps[pid]
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    chunk: List[Dict[str, Any]] = []
+    for p in sorted(projects, key=lambda p: p["project_id"]):
+        ranked = sorted(heaps[p["project_id"]], reverse=True)
+        for rank, ((score, _), developer_id, developer_name) in enumerate(ranked, start=1):
+            chunk.append({
+                "project_id": p["project_id"],
+                "project_name": p["project_name"],
+                "company_id": p["company_id"],
+                "company_name": p["company_name"],
+                "rank": rank,
+                "developer_id": developer_id,
+                "developer_name": developer_name,
+                "match_score": score,
+            })
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def write_csv(chunks: Iterator[List[Dict[str, Any]]], path: str) -> int:
+    total = 0
+    # utf-8-sig: 엑셀에서 한글이 깨지지 않도록 BOM 포함
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        w = csv.DictWriter(f, fieldnames=COLUMNS)
+        w.writeheader()
+        for chunk in chunks:
+            w.writerows(chunk)
+            total += len(chunk)
+    return total
+
+def write_parquet(chunks: Iterator[List[Dict[str, Any]]], path: str) -> int:
+    if pq is None:
+        raise RuntimeError("parquet 출력에는 pyarrow 가 필요합니다. (pip install pyarrow)")
+    schema = pa.schema([
+        ("project_id", pa.int64()),
+        ("project_name", pa.string()),
+        ("company_id", pa.int64()),
+        ("company_name", pa.string()),
+        ("rank", pa.int64()),
+        ("developer_id", pa.int64()),
+        ("developer_name", pa.string()),
+        ("match_score", pa.int64()),
+    ])
+    total = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            total += len(chunk)
+    return total
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="프로젝트별 추천 결과를 CSV/Parquet 으로 내보낸다.")
+    parser.add_argument("--out", required=True, help="출력 파일 경로")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--source", choices=["matches", "compute"], default="matches")
+    parser.add_argument("--project-id", type=int)
+    parser.add_argument("--company-id", type=int)
+    parser.add_argument("--min-score", type=int, default=0)
+    parser.add_argument("--top-k", type=int, help=f"프로젝트별 상위 k명 (compute 기본값 {DEFAULT_TOP_K}, matches 기본값 전체)")
+    parser.add_argument("--chunk-size", type=int, default=db.FETCH_CHUNK)
+    parser.add_argument("--db", default=db.DB_PATH, help="SQLite DB 경로")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and pq is None:
+        parser.error("parquet 출력에는 pyarrow 가 필요합니다. (pip install pyarrow)")
+    db.DB_PATH = args.db
+
+    if args.source == "matches":
+        chunks = iter_saved_rows(args.project_id, args.company_id, args.min_score, args.top_k, args.chunk_size)
+    else:
+        chunks = iter_computed_rows(
+            args.project_id, args.company_id, args.min_score, args.top_k or DEFAULT_TOP_K, args.chunk_size
+        )
+
+    write = write_csv if args.format == "csv" else write_parquet
+    total = write(chunks, args.out)
+    print(f"{total}건 내보내기 완료: {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+이력서 PDF 일괄 등록.
+
+    python ingest.py ./resumes [--workers 4] [--batch 50] [--llm-concurrency 8]
+
+1) 파일 내용 sha256 을 계산해 resume_files 에 이미 있는 파일은 건너뛰고
+2) 프로세스 풀에서 PyPDFLoader 로 텍스트를 추출한 뒤
+3) RecursiveCharacterTextSplitter 로 나눈 조각을 DEV_PROMPT 로 구조화(조각별 결과는 병합)하고
+4) batch 건씩 하나의 트랜잭션으로 저장한다(db.insert_resume_profiles).
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.utils.json import parse_json_markdown
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+import db
+from prompts import DEV_PROMPT
+from streaming import make_llm
+
+CHUNK_SIZE = 3000
+CHUNK_OVERLAP = 200
+HASH_BLOCK = 1 << 20
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def extract_text(path: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """(path, text, error) — 프로세스 풀에서 실행된다."""
+    try:
+        pages = PyPDFLoader(path).load()
+        return path, "\n".join(p.page_content for p in pages), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+def find_pdfs(directory: str) -> List[str]:
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+def to_number(value: Any) -> Optional[float]:
+    """
+    LLM 이 준 숫자 값을 float 로 바꾼다. "4~5", "3년" 처럼 문자열이면 처음 나온 숫자를 쓰고,
+    숫자를 찾을 수 없으면 None.
+    """
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = _NUMBER.search(str(value or ""))
+    return float(m.group()) if m else None
+
+def to_flag(value: Any) -> int:
+    """is_primary 같은 0/1 값. 숫자가 아니면 "Y"/"yes"/"true"/"주" 처럼 긍정 문자열일 때만 1."""
+    number = to_number(value)
+    if number is not None:
+        return 1 if number else 0
+    return 1 if str(value or "").strip().lower() in ("y", "yes", "true", "t", "o", "예", "주") else 0
+
+def merge_profiles(parts: List[Dict[str, Any]], fallback_name: str) -> Optional[Dict[str, Any]]:
+    """
+    조각별 구조화 결과를 하나의 프로필로 합친다.
+    이름/역할/소개는 처음 나온 값, 경력은 최댓값, 같은 기술은 레벨/연차 최댓값을 쓴다.
+    이름이 없는 기술 항목은 건너뛰고, 해석할 수 없는 레벨/연차는 기본값(3 / 0)을 쓴다.
+    """
+    parts = [p for p in parts if isinstance(p, dict)]
+    if not parts:
+        return None
+
+    def first(key: str, default: Any = None) -> Any:
+        return next((p[key] for p in parts if p.get(key)), default)
+
+    skills: Dict[str, Dict[str, Any]] = {}
+    for p in parts:
+        items = p.get("skills")
+        for s in items if isinstance(items, list) else []:
+            if not isinstance(s, dict):
+                continue
+            name = str(s.get("name") or "").strip()
+            if not name:
+                continue
+            level = to_number(s.get("level"))
+            years = to_number(s.get("experience_years"))
+            level = 3 if level is None else level
+            years = 0.0 if years is None else years
+            cur = skills.setdefault(name.lower(), {"name": name, "type": str(s.get("type") or "etc"),
+                                                   "level": 1, "experience_years": 0.0, "is_primary": 0})
+            cur["level"] = max(cur["level"], min(max(int(level), 1), 5))
+            cur["experience_years"] = max(cur["experience_years"], years)
+            cur["is_primary"] = max(cur["is_primary"], to_flag(s.get("is_primary")))
+
+    return {
+        "name": str(first("name", fallback_name)),
+        "role": str(first("role", "etc")),
+        "total_career_years": max(to_number(p.get("total_career_years") or 0) or 0.0 for p in parts),
+        "headline": first("headline"),
+        "skills": list(skills.values()),
+    }
+
+def structure_batch(chain, splitter, extracted: List[Tuple[str, str, str]], concurrency: int) -> Iterator[Tuple[str, str, Optional[Dict[str, Any]]]]:
+    """
+    extracted: [(content_hash, path, text), ...]
+    묶음 전체의 조각을 chain.batch 로 동시에 구조화하고 이력서별로 병합한다.
+    조각이 하나라도 실패(LLM 오류/JSON 파싱 실패)한 이력서는 profile=None 으로 돌려준다.
+    일부 조각만으로 저장하면 해시가 기록되어 다음 실행에서도 건너뛰므로, 실패로 세서 다시 시도하게 한다.
+    """
+    inputs, owners = [], []
+    for i, (_, _, text) in enumerate(extracted):
+        for chunk in splitter.split_text(text):
+            inputs.append({"input": chunk})
+            owners.append(i)
+
+    outputs = chain.batch(inputs, config={"max_concurrency": concurrency}, return_exceptions=True)
+
+    parts: List[List[Dict[str, Any]]] = [[] for _ in extracted]
+    errors: List[Optional[str]] = [None for _ in extracted]
+    for owner, out in zip(owners, outputs):
+        if isinstance(out, Exception):
+            errors[owner] = errors[owner] or f"LLM 호출 실패 ({type(out).__name__}: {out})"
+            continue
+        try:
+            parts[owner].append(parse_json_markdown(out.content))
+        except Exception as e:
+            errors[owner] = errors[owner] or f"JSON 파싱 실패 ({type(e).__name__})"
+
+    for (content_hash, path, _), p, error in zip(extracted, parts, errors):
+        fallback = os.path.splitext(os.path.basename(path))[0]
+        if error:
+            print(f"[실패] {path}: {error}", file=sys.stderr)
+            yield content_hash, path, None
+            continue
+        try:
+            profile = merge_profiles(p, fallback)
+        except Exception as e:
+            # 예상 못한 응답 형태라도 실행 전체를 멈추지 않고 이 이력서만 실패로 센다
+            print(f"[실패] {path}: 구조화 결과 병합 실패 ({type(e).__name__}: {e})", file=sys.stderr)
+            profile = None
+        else:
+            if profile is None:
+                print(f"[실패] {path}: 구조화 결과 없음", file=sys.stderr)
+        yield content_hash, path, profile
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="이력서 PDF 디렉터리를 구조화해서 개발자로 등록한다.")
+    parser.add_argument("directory", help="PDF 이력서 디렉터리(하위 폴더 포함)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="텍스트 추출 프로세스 수")
+    parser.add_argument("--batch", type=int, default=50, help="한 트랜잭션에 저장할 이력서 수")
+    parser.add_argument("--llm-concurrency", type=int, default=8, help="동시에 보낼 LLM 요청 수")
+    parser.add_argument("--db", default=db.DB_PATH, help="SQLite DB 경로")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    db.DB_PATH = args.db
+    # resume_files 등 스키마/마이그레이션 적용(여러 번 실행해도 안전)
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        db.init_db(f.read())
+
+    paths = find_pdfs(args.directory)
+    chain = DEV_PROMPT | make_llm()
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    saved = skipped = failed = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # 1) 내용 해시로 이미 처리한 파일(같은 실행 안의 중복 포함)을 거른다
+        hashes = dict(zip(paths, pool.map(file_hash, paths, chunksize=16)))
+        known = db.get_known_resume_hashes(list(hashes.values()))
+        todo, seen = [], set(known)
+        for path in paths:
+            if hashes[path] in seen:
+                skipped += 1
+                continue
+            seen.add(hashes[path])
+            todo.append(path)
+
+        # 2) 텍스트 추출(병렬) → 3) 구조화 → 4) batch 단위 저장
+        extracted: List[Tuple[str, str, str]] = []
+
+        def flush() -> None:
+            nonlocal saved, failed
+            resumes = []
+            for content_hash, path, profile in structure_batch(chain, splitter, extracted, args.llm_concurrency):
+                if profile is None:
+                    failed += 1  # 해시를 기록하지 않으므로 다음 실행에서 다시 시도한다
+                    continue
+                resumes.append((content_hash, os.path.basename(path), profile))
+            if resumes:
+                with db.get_conn() as conn:
+                    db.insert_resume_profiles(conn, resumes)
+                saved += len(resumes)
+            print(f"저장 {saved} / 건너뜀 {skipped} / 실패 {failed} (전체 {len(paths)})")
+            extracted.clear()
+
+        for path, text, error in pool.map(extract_text, todo, chunksize=4):
+            if error or not (text or "").strip():
+                failed += 1
+                print(f"[실패] {path}: {error or '텍스트 없음'}", file=sys.stderr)
+                continue
+            extracted.append((hashes[path], path, text))
+            if len(extracted) >= args.batch:
+                flush()
+        if extracted:
+            flush()
+
+    print(f"완료: 저장 {saved} / 건너뜀 {skipped} / 실패 {failed}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,70 +1,223 @@
-from typing import Dict, List, Tuple
+import json
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
 
-def calc_match_score(
+# 매칭 상세(breakdown) 항목: [skill_id, level_ratio, years_ratio, weight, fail_code]
+# matches.breakdown 에 JSON 배열로 저장하고, reason 텍스트는 조회할 때 render_reason 으로 만든다.
+FAIL_NONE = 0               # 충족(점수 반영)
+FAIL_OPTIONAL_MISSING = 1   # 선택 기술 미보유
+FAIL_MANDATORY_MISSING = 2  # 필수 기술 미보유 → 0점
+FAIL_MANDATORY_LEVEL = 3    # 필수 기술 숙련도 부족 → 0점
+FAIL_MANDATORY_YEARS = 4    # 필수 기술 사용 연차 부족 → 0점
+FAIL_CAREER = 5             # 전체 경력 부족 → 0점 (skill_id 없음)
+
+Breakdown = List[list]
+
+def skill_map(dev_skills: List[Dict]) -> Dict[str, Dict]:
+    """{소문자 기술 이름: 기술} — ProjectScorer.score 의 dev_map (개발자마다 한 번만 만들어 재사용)"""
+    return {s["skill_name"].lower(): s for s in dev_skills}
+
+class ProjectScorer:
+    """
+    프로젝트 요구 기술을 한 번만 해석(compile)해 두고 개발자마다 점수만 계산한다.
+
+    가중치/max_score/최소 레벨·연차의 역수를 미리 계산하고, 필수 조건 체크는
+    보유 개발자 수가 적은(희귀한) 기술부터 검사해서 탈락을 가장 빨리 판정한다.
+    skill_counts: {skill_id: 보유 개발자 수} (없으면 요구 기술 순서대로 검사)
+    """
+
+    __slots__ = ("min_total_career", "max_score", "mandatory", "requirements")
+
+    def __init__(self, project: Dict, reqs: List[Dict], skill_counts: Optional[Dict[int, int]] = None):
+        self.min_total_career = float(project["min_total_career"])
+
+        # (key, skill_id, weight, min_level, min_years, 1/min_level, 1/min_years, is_mandatory)
+        self.requirements = []
+        for r in reqs:
+            min_level = float(r["min_skill_level"])
+            min_years = float(r["min_experience_years"])
+            self.requirements.append((
+                r["skill_name"].lower(),
+                r.get("skill_id"),
+                int(r["weight"]),
+                min_level,
+                min_years,
+                1.0 / min_level if min_level > 0 else None,
+                1.0 / min_years if min_years > 0 else None,
+                int(r["is_mandatory"]) == 1,
+            ))
+        self.max_score = sum(req[2] * 2.0 for req in self.requirements)  # level + years
+
+        mandatory = [req for req in self.requirements if req[7]]
+        if skill_counts:
+            # 보유자가 적은 기술일수록 탈락시킬 확률이 높으므로 먼저 검사(같으면 원래 순서)
+            mandatory.sort(key=lambda req: skill_counts.get(req[1], 0))
+        self.mandatory = [(key, skill_id, weight, min_level, min_years) for key, skill_id, weight, min_level, min_years, _, _, _ in mandatory]
+
+    def score(self, dev: Dict, dev_skills: List[Dict], dev_map: Optional[Dict[str, Dict]] = None) -> Tuple[int, Breakdown]:
+        """
+        dev_map: skill_map(dev_skills) 결과. 한 개발자를 여러 프로젝트로 채점할 때는
+        호출하는 쪽에서 한 번만 만들어 넘기면 필수 조건 탈락이 dict 조회 몇 번으로 끝난다.
+        """
+        # 1) 전체 경력 필터
+        if float(dev["total_career_years"]) < self.min_total_career:
+            return 0, [[None, 0.0, 0.0, 0, FAIL_CAREER]]
+
+        if dev_map is None:
+            dev_map = skill_map(dev_skills)
+
+        # 2) 필수 조건 체크 (희귀한 기술부터)
+        for key, skill_id, weight, min_level, min_years in self.mandatory:
+            s = dev_map.get(key)
+            if s is None:
+                return 0, [[skill_id, 0.0, 0.0, weight, FAIL_MANDATORY_MISSING]]
+            if s["skill_level"] < min_level:
+                return 0, [[skill_id, 0.0, 0.0, weight, FAIL_MANDATORY_LEVEL]]
+            if s["experience_years"] < min_years:
+                return 0, [[skill_id, 0.0, 0.0, weight, FAIL_MANDATORY_YEARS]]
+
+        # 3) 점수 계산 (레벨 + 연차)
+        score = 0.0
+        breakdown = []
+        for key, skill_id, weight, _, _, inv_level, inv_years, _ in self.requirements:
+            s = dev_map.get(key)
+            if s is None:
+                # 여기까지 오면 필수는 모두 존재하므로 선택 기술만 해당
+                breakdown.append([skill_id, 0.0, 0.0, weight, FAIL_OPTIONAL_MISSING])
+                continue
+
+            # level / years 충족률 (0~1)
+            level_ratio = min(float(s["skill_level"]) * inv_level, 1.0) if inv_level is not None else 1.0
+            years_ratio = min(float(s["experience_years"]) * inv_years, 1.0) if inv_years is not None else 1.0
+
+            score += (level_ratio + years_ratio) * weight
+            breakdown.append([skill_id, round(level_ratio, 2), round(years_ratio, 2), weight, FAIL_NONE])
+
+        final = int(round((score / self.max_score) * 100)) if self.max_score > 0 else 0
+        return final, breakdown
+
+def rank_key(score: int, developer_id: int) -> Tuple[int, int]:
+    """
+    추천 순위 정렬 키(클수록 앞 순위). 같은 점수면 developer_id 가 작은 쪽이 앞 순위로,
+    화면 추천(recommend)·즉석 내보내기(export)·저장된 matches 순서(db.iter_ranked_matches)가 모두 같다.
+    """
+    return score, -developer_id
+
+SCORER_CACHE_SIZE = 128
+_scorer_cache: Dict[Tuple[int, int], ProjectScorer] = {}
+_scorer_lock = threading.Lock()
+
+def requirements_version(project: Dict, reqs: List[Dict]) -> int:
+    """스코어러에 영향을 주는 값(최소 경력 + 요구 기술)이 바뀌면 달라지는 버전 값."""
+    return hash((
+        float(project["min_total_career"]),
+        tuple(
+            (r.get("skill_id"), r["skill_name"], r["min_skill_level"], r["min_experience_years"], r["weight"], r["is_mandatory"])
+            for r in reqs
+        ),
+    ))
+
+def get_scorer(
+    project_id: int,
+    project: Dict,
+    reqs: List[Dict],
+    skill_counts: Optional[Callable[[List[int]], Dict[int, int]]] = None,
+) -> ProjectScorer:
+    """
+    (project_id, requirements_version) 별로 컴파일된 스코어러를 캐시해서 돌려준다.
+    skill_counts: 캐시 미스일 때만 호출되는 {skill_id: 보유 개발자 수} 조회 함수 (예: db.get_skill_holder_counts)
+    """
+    cache_key = (project_id, requirements_version(project, reqs))
+    with _scorer_lock:
+        scorer = _scorer_cache.get(cache_key)
+    if scorer is not None:
+        return scorer
+
+    counts = skill_counts([r["skill_id"] for r in reqs if r.get("skill_id") is not None]) if skill_counts else None
+    scorer = ProjectScorer(project, reqs, counts)
+    with _scorer_lock:
+        if len(_scorer_cache) >= SCORER_CACHE_SIZE:
+            _scorer_cache.pop(next(iter(_scorer_cache)))
+        _scorer_cache[cache_key] = scorer
+    return scorer
+
+def calc_match_breakdown(
     dev: Dict,
     project: Dict,
     dev_skills: List[Dict],
     reqs: List[Dict],
-) -> Tuple[int, str]:
+) -> Tuple[int, Breakdown]:
     """
     dev: {"total_career_years":..., "role":...}
     project: {"min_total_career":...}
     dev_skills: [{"skill_name":..., "skill_level":..., "experience_years":...}, ...]
-    reqs: [{"skill_name":..., "min_skill_level":..., "min_experience_years":..., "weight":..., "is_mandatory":...}, ...]
+    reqs: [{"skill_id":..., "skill_name":..., "min_skill_level":..., "min_experience_years":..., "weight":..., "is_mandatory":...}, ...]
+    여러 개발자를 채점할 때는 get_scorer 로 컴파일된 스코어러를 재사용한다.
     """
-    # 1) 전체 경력 필터
-    if float(dev["total_career_years"]) < float(project["min_total_career"]):
-        return 0, "전체 경력이 최소 요구 경력보다 낮습니다."
-
-    dev_map = {s["skill_name"].lower(): s for s in dev_skills}
-
-    # 2) 필수 조건 체크
-    for r in reqs:
-        if int(r["is_mandatory"]) == 1:
-            key = r["skill_name"].lower()
-            if key not in dev_map:
-                return 0, f"필수 기술({r['skill_name']})이 없습니다."
-
-            s = dev_map[key]
-            if int(s["skill_level"]) < int(r["min_skill_level"]):
-                return 0, f"필수 기술({r['skill_name']}) 숙련도 부족."
-            if float(s["experience_years"]) < float(r["min_experience_years"]):
-                return 0, f"필수 기술({r['skill_name']}) 사용 연차 부족."
-
-    # 3) 점수 계산 (레벨 + 연차)
-    score = 0.0
-    max_score = 0.0
-    reasons = []
+    return ProjectScorer(project, reqs).score(dev, dev_skills)
 
-    for r in reqs:
-        weight = float(r["weight"])
-        max_score += weight * 2.0  # level + years
+def render_reason(
+    breakdown: Breakdown,
+    skill_names: Dict[int, str],
+    dev_skills: Optional[List[Dict]] = None,
+    reqs: Optional[List[Dict]] = None,
+) -> str:
+    """
+    breakdown 을 사람이 읽는 매칭 상세 텍스트로 만든다. skill_names: {skill_id: skill_name}
+    실시간 채점 화면처럼 dev_skills/reqs 가 있으면 충족률과 함께 실제 레벨/연차 값도 보여준다.
+    """
+    def name(skill_id: Optional[int]) -> str:
+        if skill_id is None:
+            return "삭제된 기술"  # 마이그레이션 당시 skills 에 없던 기술
+        return skill_names.get(skill_id, f"skill#{skill_id}")
 
-        key = r["skill_name"].lower()
-        if key not in dev_map:
-            if int(r["is_mandatory"]) == 1:
-                # 여기까지 오면 필수는 모두 존재하므로 실질적으로는 안 걸림
-                continue
-            else:
-                reasons.append(f"- {r['skill_name']}: 보유하지 않음(선택)")
-                continue
+    if len(breakdown) == 1 and breakdown[0][4] >= FAIL_MANDATORY_MISSING:
+        skill_id, _, _, _, code = breakdown[0]
+        if code == FAIL_CAREER:
+            return "전체 경력이 최소 요구 경력보다 낮습니다."
+        if code == FAIL_MANDATORY_MISSING:
+            return f"필수 기술({name(skill_id)})이 없습니다."
+        if code == FAIL_MANDATORY_LEVEL:
+            return f"필수 기술({name(skill_id)}) 숙련도 부족."
+        return f"필수 기술({name(skill_id)}) 사용 연차 부족."
 
-        s = dev_map[key]
+    req_by_id = {r.get("skill_id"): r for r in reqs or []}
+    dev_map = skill_map(dev_skills or [])
 
-        # level 충족률 (0~1)
-        level_ratio = min(float(s["skill_level"]) / float(r["min_skill_level"]), 1.0) if float(r["min_skill_level"]) > 0 else 1.0
-        # years 충족률 (0~1)
-        years_ratio = min(float(s["experience_years"]) / float(r["min_experience_years"]), 1.0) if float(r["min_experience_years"]) > 0 else 1.0
+    reasons = []
+    for skill_id, level_ratio, years_ratio, weight, code in breakdown:
+        r = req_by_id.get(skill_id) if skill_id is not None else None
+        s = dev_map.get(r["skill_name"].lower()) if r else None
+        if code == FAIL_OPTIONAL_MISSING:
+            reasons.append(f"- {name(skill_id)}: 보유하지 않음(선택)")
+        elif s is not None:
+            reasons.append(
+                f"- {name(skill_id)}: 레벨 {s['skill_level']}/{r['min_skill_level']}({level_ratio:.2f}), "
+                f"연차 {s['experience_years']}/{r['min_experience_years']}({years_ratio:.2f}), 가중치 {weight}"
+            )
+        else:
+            reasons.append(
+                f"- {name(skill_id)}: 레벨 충족률 {level_ratio:.2f}, "
+                f"연차 충족률 {years_ratio:.2f}, 가중치 {weight}"
+            )
+    return "기술 매칭 상세:\n" + "\n".join(reasons)
 
-        part = (level_ratio + years_ratio) * weight
-        score += part
+def encode_breakdown(breakdown: Breakdown) -> str:
+    return json.dumps(breakdown, separators=(",", ":"))
 
-        reasons.append(
-            f"- {r['skill_name']}: 레벨 {s['skill_level']}/{r['min_skill_level']}({level_ratio:.2f}), "
-            f"연차 {s['experience_years']}/{r['min_experience_years']}({years_ratio:.2f}), "
-            f"가중치 {int(r['weight'])}"
-        )
+def decode_breakdown(text: Optional[str]) -> Breakdown:
+    return json.loads(text) if text else []
 
-    final = int(round((score / max_score) * 100)) if max_score > 0 else 0
-    reason_text = "기술 매칭 상세:\n" + "\n".join(reasons)
-    return final, reason_text
\ No newline at end of file
+def calc_match_score(
+    dev: Dict,
+    project: Dict,
+    dev_skills: List[Dict],
+    reqs: List[Dict],
+) -> Tuple[int, str]:
+    """calc_match_breakdown 결과를 바로 텍스트로 만들어 (점수, 이유) 로 돌려준다."""
+    if any(r.get("skill_id") is None for r in reqs):
+        # skill_id 가 없는 요구 기술이 있으면 순번을 임시 id 로 써서 기술 이름을 구분한다
+        reqs = [dict(r, skill_id=i) for i, r in enumerate(reqs)]
+    score, breakdown = calc_match_breakdown(dev, project, dev_skills, reqs)
+    skill_names = {r["skill_id"]: r["skill_name"] for r in reqs}
+    return score, render_reason(breakdown, skill_names, dev_skills, reqs)
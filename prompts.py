@@ -0,0 +1,44 @@
+from langchain_core.prompts import ChatPromptTemplate
+
+# ----------------------------
+# 프롬프트 (app.py, ingest.py 공용)
+# ----------------------------
+DEV_PROMPT = ChatPromptTemplate.from_template("""
+너는 개발자 커리어를 구조화하는 AI다.
+반드시 JSON만 출력해라. 마크다운/설명 문장 금지.
+
+형식:
+{{
+  "name": "",
+  "role": "backend|frontend|fullstack|etc",
+  "total_career_years": number,
+  "headline": "",
+  "skills": [
+    {{"name":"", "type":"language|framework|db|tool|etc", "level":1~5, "experience_years": number, "is_primary":0|1}}
+  ]
+}}
+
+입력:
+{input}
+""")
+
+PROJECT_PROMPT = ChatPromptTemplate.from_template("""
+너는 기업 프로젝트를 구조화하는 AI다.
+반드시 JSON만 출력해라. 마크다운/설명 문장 금지.
+
+형식:
+{{
+  "company_name": "",
+  "industry": "",
+  "project_name": "",
+  "description": "",
+  "min_total_career": number,
+  "requirements": [
+    {{"skill":"", "type":"language|framework|db|tool|etc",
+     "min_level":1~5, "min_years": number, "weight":1~5, "mandatory":true|false}}
+  ]
+}}
+
+입력:
+{input}
+""")
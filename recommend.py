@@ -0,0 +1,124 @@
+import heapq
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import db
+from matching import Breakdown, get_scorer, rank_key
+
+SHARD_SIZE = 500   # 이 인원만큼 채점할 때마다 중간 결과(top-k)를 공개
+MAX_TOP_N = 20     # 화면의 "추천 인원 수" 최댓값 — 이만큼 유지해 두면 top_n 변경 시 재계산 불필요
+MAX_JOBS = 32      # 프로세스 전체에서 보관할 계산 작업 수(넘으면 오래된 것부터 취소/정리)
+
+# (score, developer_id, name, role, breakdown, dev_skills)
+Recommendation = Tuple[int, int, str, str, Breakdown, List[Dict[str, Any]]]
+
+
+class RecommendationJob:
+    """
+    한 프로젝트의 추천 순위를 백그라운드 스레드에서 계산한다.
+    개발자 풀을 SHARD_SIZE 명씩 채점하며 top-k 를 갱신하므로 계산 중에도 중간 결과를 볼 수 있다.
+    cancel() 하면 다음 샤드 경계에서 멈춘다(done=True, cancelled=True).
+    """
+
+    def __init__(
+        self,
+        project_id: int,
+        data_version: int,
+        project: Dict[str, Any],
+        reqs: List[Dict[str, Any]],
+        top_k: int = MAX_TOP_N,
+    ):
+        self.project_id = project_id
+        self.data_version = data_version
+        self.top_k = top_k
+        self.total = 0  # _run 에서 센다(get_job 이 락을 잡은 채 DB 를 읽지 않도록)
+        self.scanned = 0
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._cancel = threading.Event()
+        self._project = project
+        self._reqs = reqs
+        self._heap: List[Tuple[Tuple[int, int], Recommendation]] = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"recommend-{project_id}", daemon=True)
+
+    def start(self) -> "RecommendationJob":
+        self._thread.start()
+        return self
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def _run(self) -> None:
+        try:
+            self.total = db.count_developers()
+            scorer = get_scorer(self.project_id, self._project, self._reqs, db.get_skill_holder_counts)
+            heap: List[Tuple[Tuple[int, int], Recommendation]] = []
+            scanned = 0
+            for dev, skills in db.iter_developers_with_skills(SHARD_SIZE):
+                scanned += 1
+                score, breakdown = scorer.score(dev, skills)
+                if score > 0:
+                    item = (rank_key(score, dev["developer_id"]),
+                            (score, dev["developer_id"], dev["name"], dev["role"], breakdown, skills))
+                    if len(heap) < self.top_k:
+                        heapq.heappush(heap, item)
+                    elif item[0] > heap[0][0]:
+                        heapq.heapreplace(heap, item)
+                if scanned % SHARD_SIZE == 0:
+                    if self._cancel.is_set():
+                        return
+                    self._publish(heap, scanned)
+            self._publish(heap, scanned)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def _publish(self, heap: List[Tuple[Tuple[int, int], Recommendation]], scanned: int) -> None:
+        with self._lock:
+            self._heap = list(heap)
+            self.scanned = scanned
+
+    def progress(self) -> float:
+        if self.done:
+            return 1.0
+        return min(self.scanned / self.total, 1.0) if self.total else 0.0
+
+    def top(self, n: int) -> List[Recommendation]:
+        """지금까지 공개된 중간/최종 결과 중 상위 n 명"""
+        with self._lock:
+            ranked = sorted(self._heap, key=lambda item: item[0], reverse=True)
+        return [rec for _, rec in ranked[:n]]
+
+
+_jobs: Dict[Tuple[int, int], RecommendationJob] = {}  # 추가된 순서 = 오래된 순서
+_jobs_lock = threading.Lock()
+
+
+def get_job(project_id: int, data_version: int, project: Dict[str, Any], reqs: List[Dict[str, Any]]) -> RecommendationJob:
+    """
+    (project_id, data_version) 별 계산 작업을 돌려준다. 없으면 새로 시작한다.
+    같은 키라면 세션/rerun 이 달라도 진행 중이거나 끝난 결과를 그대로 재사용한다.
+    새 버전의 작업을 시작하면 같은 프로젝트의 이전 버전 작업은 취소/정리한다.
+    """
+    key = (project_id, data_version)
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is not None and job.error is None and not job.cancelled:
+            return job
+
+        for old_key in [k for k in _jobs if k[0] == project_id]:
+            _jobs.pop(old_key).cancel()
+        # 그래도 많으면 끝난 작업부터, 그다음 진행 중인 작업을 오래된 순으로 취소/정리
+        if len(_jobs) >= MAX_JOBS:
+            by_age = sorted(_jobs, key=lambda k: not _jobs[k].done)  # 안정 정렬: 끝난 작업이 앞, 각각 오래된 순
+            for old_key in by_age[: len(_jobs) - MAX_JOBS + 1]:
+                _jobs.pop(old_key).cancel()
+
+        job = _jobs[key] = RecommendationJob(project_id, data_version, project, reqs).start()
+        return job
@@ -71,17 +71,53 @@ CREATE TABLE IF NOT EXISTS matches (
   project_id INTEGER NOT NULL,
   developer_id INTEGER NOT NULL,
   match_score INTEGER NOT NULL CHECK(match_score BETWEEN 0 AND 100),
-  reason TEXT,
+  breakdown TEXT,                        -- [[skill_id, level_ratio, years_ratio, weight, fail_code], ...] (JSON, matching.py 참고)
   created_at TEXT DEFAULT (datetime('now')),
   UNIQUE(project_id, developer_id),
   FOREIGN KEY (project_id) REFERENCES projects(project_id) ON DELETE CASCADE,
   FOREIGN KEY (developer_id) REFERENCES developers(developer_id) ON DELETE CASCADE
 );
 
--- 추천/조회 최적화용 인덱스
-CREATE INDEX IF NOT EXISTS idx_dev_role ON developers(role);
-CREATE INDEX IF NOT EXISTS idx_dev_total_career ON developers(total_career_years);
-CREATE INDEX IF NOT EXISTS idx_proj_company ON projects(company_id);
-CREATE INDEX IF NOT EXISTS idx_skill_name ON skills(skill_name);
-CREATE INDEX IF NOT EXISTS idx_dev_skills_skill ON developer_skills(skill_id);
-CREATE INDEX IF NOT EXISTS idx_proj_req_skill ON project_requirements(skill_id);
+-- 이력서 PDF 처리 이력(ingest.py, 같은 내용의 파일은 다시 처리하지 않음)
+CREATE TABLE IF NOT EXISTS resume_files (
+  content_hash TEXT PRIMARY KEY,         -- PDF 파일 내용의 sha256
+  developer_id INTEGER,
+  file_name TEXT NOT NULL,
+  created_at TEXT DEFAULT (datetime('now')),
+  FOREIGN KEY (developer_id) REFERENCES developers(developer_id) ON DELETE SET NULL
+);
+
+-- 데이터 버전(추천 계산 캐시 키): 개발자/보유 기술/프로젝트/요구 기술이 바뀔 때마다 트리거로 증가
+CREATE TABLE IF NOT EXISTS data_version (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO data_version(id, version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_ver_dev_ins AFTER INSERT ON developers BEGIN UPDATE data_version SET version=version+1 WHERE id=1; END;
+CREATE TRIGGER IF NOT EXISTS trg_ver_dev_upd AFTER UPDATE ON developers BEGIN UPDATE data_version SET version=version+1 WHERE id=1; END;
+CREATE TRIGGER IF NOT EXISTS trg_ver_dev_del AFTER DELETE ON developers BEGIN UPDATE data_version SET version=version+1 WHERE id=1; END;
+CREATE TRIGGER IF NOT EXISTS trg_ver_ds_ins AFTER INSERT ON developer_skills BEGIN UPDATE data_version SET version=version+1 WHERE id=1; END;
+CREATE TRIGGER IF NOT EXISTS trg_ver_ds_upd AFTER UPDATE ON developer_skills BEGIN UPDATE data_version SET version=version+1 WHERE id=1; END;
+CREATE TRIGGER IF NOT EXISTS trg_ver_ds_del AFTER DELETE ON developer_skills BEGIN UPDATE data_version SET version=version+1 WHERE id=1; END;
+CREATE TRIGGER IF NOT EXISTS trg_ver_proj_upd AFTER UPDATE ON projects BEGIN UPDATE data_version SET version=version+1 WHERE id=1; END;
+CREATE TRIGGER IF NOT EXISTS trg_ver_pr_ins AFTER INSERT ON project_requirements BEGIN UPDATE data_version SET version=version+1 WHERE id=1; END;
+CREATE TRIGGER IF NOT EXISTS trg_ver_pr_upd AFTER UPDATE ON project_requirements BEGIN UPDATE data_version SET version=version+1 WHERE id=1; END;
+CREATE TRIGGER IF NOT EXISTS trg_ver_pr_del AFTER DELETE ON project_requirements BEGIN UPDATE data_version SET version=version+1 WHERE id=1; END;
+CREATE TRIGGER IF NOT EXISTS trg_ver_skill_upd AFTER UPDATE OF skill_name ON skills BEGIN UPDATE data_version SET version=version+1 WHERE id=1; END;
+
+-- 추천/조회 최적화용 인덱스 (db.py 의 실제 조회 경로 기준, check_query_plans.py 로 검증)
+CREATE INDEX IF NOT EXISTS idx_proj_status_created ON projects(status, created_at);        -- list_open_projects
+CREATE INDEX IF NOT EXISTS idx_proj_company ON projects(company_id);                         -- companies 삭제 시 CASCADE
+CREATE INDEX IF NOT EXISTS idx_dev_created ON developers(created_at);                        -- list_developers
+CREATE INDEX IF NOT EXISTS idx_dev_skills_skill ON developer_skills(skill_id);               -- get_skill_holder_counts, skills 삭제 시 CASCADE
+CREATE INDEX IF NOT EXISTS idx_proj_req_skill ON project_requirements(skill_id);             -- skills 삭제 시 CASCADE
+CREATE INDEX IF NOT EXISTS idx_match_created ON matches(created_at, project_id, developer_id, match_score);  -- list_matches (covering)
+CREATE INDEX IF NOT EXISTS idx_match_project_score ON matches(project_id, match_score DESC, developer_id);   -- iter_ranked_matches (covering)
+CREATE INDEX IF NOT EXISTS idx_match_developer ON matches(developer_id);                     -- developers 삭제 시 CASCADE
+CREATE INDEX IF NOT EXISTS idx_resume_developer ON resume_files(developer_id);               -- developers 삭제 시 SET NULL
+
+-- 사용되지 않거나 중복인 인덱스 정리 (skill_name 은 UNIQUE 자동 인덱스와 중복)
+DROP INDEX IF EXISTS idx_skill_name;
+DROP INDEX IF EXISTS idx_dev_role;
+DROP INDEX IF EXISTS idx_dev_total_career;
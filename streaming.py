@@ -0,0 +1,157 @@
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.utils.json import parse_json_markdown, parse_partial_json
+
+# FAKE_LLM=1 이면 OpenAI 대신 FakeStreamingChatModel 을 사용한다(오프라인 테스트용)
+FAKE_LLM = os.getenv("FAKE_LLM", "0") == "1"
+FAKE_LLM_DELAY = float(os.getenv("FAKE_LLM_DELAY", "0.02"))
+
+FAKE_RESPONSES = {
+    "개발자 커리어를 구조화": """{
+  "name": "홍길동",
+  "role": "backend",
+  "total_career_years": 5,
+  "headline": "Java/Spring 백엔드 개발자",
+  "skills": [
+    {"name": "Java", "type": "language", "level": 5, "experience_years": 5, "is_primary": 1},
+    {"name": "Spring", "type": "framework", "level": 4, "experience_years": 4, "is_primary": 1},
+    {"name": "Oracle", "type": "db", "level": 4, "experience_years": 3, "is_primary": 0}
+  ]
+}""",
+    "기업 프로젝트를 구조화": """{
+  "company_name": "테스트기업",
+  "industry": "금융",
+  "project_name": "차세대 계정계 구축",
+  "description": "Java/Spring 기반 계정계 시스템 구축",
+  "min_total_career": 3,
+  "requirements": [
+    {"skill": "Java", "type": "language", "min_level": 4, "min_years": 3, "weight": 5, "mandatory": true},
+    {"skill": "Oracle", "type": "db", "min_level": 3, "min_years": 2, "weight": 4, "mandatory": true},
+    {"skill": "Docker", "type": "tool", "min_level": 2, "min_years": 1, "weight": 2, "mandatory": false}
+  ]
+}""",
+}
+FAKE_DEFAULT_RESPONSE = (
+    "이 개발자는 프로젝트의 필수 기술을 모두 보유하고 있으며, "
+    "요구 연차 이상의 실무 경험을 갖추고 있어 기술적으로 적합합니다."
+)
+
+
+class FakeStreamingChatModel(BaseChatModel):
+    """
+    프롬프트에 포함된 키워드로 미리 정해둔 응답을 골라 chunk_size 글자씩 스트리밍하는 가짜 LLM.
+    """
+
+    responses: Dict[str, str] = FAKE_RESPONSES
+    default_response: str = FAKE_DEFAULT_RESPONSE
+    chunk_size: int = 4
+    delay: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-streaming-chat"
+
+    def _pick(self, messages: List[BaseMessage]) -> str:
+        text = str(messages[-1].content) if messages else ""
+        for keyword, response in self.responses.items():
+            if keyword in text:
+                return response
+        return self.default_response
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = AIMessage(content=self._pick(messages))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        text = self._pick(messages)
+        for i in range(0, len(text), self.chunk_size):
+            if self.delay:
+                time.sleep(self.delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text[i:i + self.chunk_size]))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+def make_llm() -> BaseChatModel:
+    if FAKE_LLM:
+        return FakeStreamingChatModel(delay=FAKE_LLM_DELAY)
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0.2, streaming=True)
+
+
+def stream_text(chain: Runnable, inputs: Dict[str, Any]) -> Iterator[str]:
+    """chain.stream 결과에서 토큰 문자열만 꺼낸다(st.write_stream 용)."""
+    for chunk in chain.stream(inputs):
+        yield getattr(chunk, "content", chunk)
+
+
+def stream_json(chain: Runnable, inputs: Dict[str, Any]) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """
+    JSON 을 출력하는 chain 을 스트리밍하면서 (지금까지의 원본 응답, 부분 파싱 결과) 를 돌려준다.
+    부분 파싱은 닫히지 않은 괄호/문자열을 보정해서 읽으며, 아직 읽을 수 없으면 None.
+
+    증분 파서가 아니라 토큰마다 버퍼 전체를 parse_partial_json 으로 다시 파싱한다(응답 길이에 대해 O(n²)).
+    구조화 응답은 수 KB 정도라 감수하며, 파싱 결과가 바뀌지 않은 토큰은 돌려주지 않는다.
+    """
+    raw = ""
+    last: Optional[Dict[str, Any]] = None
+    for token in stream_text(chain, inputs):
+        raw += token
+        try:
+            partial = parse_json_markdown(raw, parser=parse_partial_json)
+        except Exception:
+            partial = None
+        if not isinstance(partial, dict) or partial == last:
+            continue
+        last = partial
+        yield raw, partial
+    # 마지막 토큰이 파싱 결과를 바꾸지 않았더라도 최종 원본 응답은 돌려준다
+    yield raw, last
+
+
+def completed_items(partial: Optional[Dict[str, Any]], key: str, done: bool = False) -> List[Dict[str, Any]]:
+    """
+    부분 파싱 결과의 배열(key)에서 다 받은 항목만 돌려준다.
+    스트리밍 중에는 마지막 항목이 아직 채워지는 중일 수 있으므로 제외한다.
+    """
+    items = (partial or {}).get(key) or []
+    if not isinstance(items, list):
+        return []
+    return items if done else items[:-1]
+
+
+def check_items(items: List[Dict[str, Any]], name_key: str, level_key: str) -> List[str]:
+    """다 받은 기술 항목을 검증하고 문제 목록을 돌려준다."""
+    problems = []
+    for i, item in enumerate(items, start=1):
+        if not isinstance(item, dict):
+            problems.append(f"{i}번째 항목이 객체가 아닙니다.")
+            continue
+        name = str(item.get(name_key) or "").strip()
+        if not name:
+            problems.append(f"{i}번째 항목에 기술 이름({name_key})이 없습니다.")
+            continue
+        level = item.get(level_key)
+        if not isinstance(level, (int, float)) or not 1 <= level <= 5:
+            problems.append(f"{name}: {level_key} 값({level})이 1~5 범위가 아닙니다.")
+    return problems
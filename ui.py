@@ -0,0 +1,56 @@
+from typing import Any, Dict, Optional
+
+import streamlit as st
+from langchain_core.runnables import Runnable
+
+from streaming import check_items, completed_items, stream_json
+
+
+def stream_structuring(
+    chain: Runnable,
+    user_text: str,
+    items_key: str,
+    name_key: str,
+    level_key: str,
+    keep_preview: bool = True,
+) -> str:
+    """
+    구조화 응답을 스트리밍하면서 부분 JSON 을 미리보기로 보여주고,
+    다 받은 기술 항목은 응답이 끝나기 전에 바로 검증한다. 최종 원본 응답을 돌려준다.
+    keep_preview=False 면 응답이 끝난 뒤 미리보기를 지운다(검증 경고는 남긴다).
+    """
+    preview = st.empty()
+    problems_box = st.empty()
+
+    rendered = None  # 마지막으로 그린 (기술 외 필드, 다 받은 항목 수)
+
+    def render(partial: Dict[str, Any], done: bool) -> None:
+        nonlocal rendered
+        items = completed_items(partial, items_key, done=done)
+        header = {k: v for k, v in partial.items() if k != items_key}
+        # 토큰마다 다시 그리지 않고, 보이는 내용이 바뀐 경우에만 갱신/검증한다
+        if rendered == (header, len(items)):
+            return
+        rendered = (header, len(items))
+        with preview.container():
+            st.json(header)
+            if items:
+                st.dataframe(items, use_container_width=True)
+        problems = check_items(items, name_key, level_key)
+        if problems:
+            problems_box.warning("\n".join(problems))
+
+    raw = ""
+    last: Optional[Dict[str, Any]] = None
+    for raw, partial in stream_json(chain, {"input": user_text}):
+        if partial is None:
+            continue
+        last = partial
+        render(partial, done=False)
+
+    # 스트리밍 중에는 마지막 항목을 건너뛰므로 응답이 끝나면 전체 항목으로 한 번 더 검증
+    if last is not None:
+        render(last, done=True)
+    if not keep_preview:
+        preview.empty()
+    return raw
@@ -0,0 +1,176 @@
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+import db
+
+# 쓰기 연산: db.insert_developer 처럼 첫 번째 인자로 conn 을 받는 함수
+WriteOp = Callable[..., Any]
+
+MAX_QUEUE = 1000       # 큐가 가득 차면 submit 이 기다린다(backpressure)
+MAX_BATCH = 100        # 한 트랜잭션에 묶을 최대 연산 수
+SUBMIT_TIMEOUT = 5.0   # 이 시간 안에 큐에 넣지 못하면 queue.Full
+RESULT_TIMEOUT = 30.0  # 화면에서 Future.result() 를 기다리는 최대 시간
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class DBWriter:
+    """
+    프로세스 전체에서 하나만 두는 SQLite 쓰기 전용 스레드.
+
+    여러 Streamlit 세션의 쓰기를 큐로 받아 한 스레드/한 커넥션에서
+    묶음 단위 트랜잭션으로 실행하므로 "database is locked" 경합이 생기지 않는다.
+    submit 은 Future 를 돌려주며, 커밋이 끝난 뒤에 결과(생성된 id 등)가 채워진다.
+    """
+
+    def __init__(self, max_queue: int = MAX_QUEUE, max_batch: int = MAX_BATCH):
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._max_batch = max_batch
+        self._closed = False
+        self._failed: Optional[BaseException] = None  # 쓰기 스레드가 죽은 원인
+        self._stopped = False                          # 쓰기 스레드가 더 이상 큐를 읽지 않음
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, op: WriteOp, *args: Any, timeout: Optional[float] = SUBMIT_TIMEOUT) -> Future:
+        fut: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("DBWriter가 이미 종료되었습니다.")
+            if self._failed is not None:
+                raise RuntimeError(f"DBWriter 쓰기 스레드가 중단되었습니다: {self._failed}") from self._failed
+        # 큐가 가득 차면 timeout 동안 기다리고, 그래도 자리가 없으면 queue.Full
+        # (다른 submit/close 가 기다리지 않도록 락 밖에서 넣는다)
+        self._queue.put((op, args, fut), timeout=timeout)
+        if self._stopped:
+            # 넣는 사이에 쓰기 스레드가 끝났다면 아무도 꺼내지 않으므로 직접 실패 처리
+            self._fail_pending()
+        return fut
+
+    @property
+    def failed(self) -> bool:
+        return self._failed is not None
+
+    def close(self) -> None:
+        """남은 쓰기를 모두 커밋하고 스레드를 종료한다."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = db.get_conn()
+            conn.isolation_level = None  # 트랜잭션은 _commit_batch 에서 직접 관리
+            conn.execute("PRAGMA journal_mode = WAL;")
+            stop = False
+            while not stop:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                batch = [item]
+                # 이미 쌓여있는 연산을 한 트랜잭션으로 묶는다
+                while len(batch) < self._max_batch:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                self._commit_batch(conn, batch)
+        except Exception as e:
+            logger.exception("DBWriter 쓰기 스레드가 중단되었습니다.")
+            with self._lock:
+                self._failed = e
+        finally:
+            self._stopped = True
+            if conn is not None:
+                conn.close()
+            self._fail_pending()
+
+    def _fail_pending(self) -> None:
+        """큐에 남은(더 이상 실행되지 않을) 연산의 Future 를 모두 실패로 끝낸다."""
+        err = self._failed or RuntimeError("DBWriter가 이미 종료되었습니다.")
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is _STOP:
+                continue
+            _, _, fut = item
+            if fut.set_running_or_notify_cancel():
+                fut.set_exception(err)
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: List[Tuple[WriteOp, tuple, Future]]) -> None:
+        done: List[Tuple[Future, Any, Optional[BaseException]]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for op, args, fut in batch:
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                # 연산 하나가 실패해도 같은 묶음의 다른 연산은 커밋되도록 SAVEPOINT 로 감싼다
+                conn.execute("SAVEPOINT write_op")
+                try:
+                    result = op(conn, *args)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write_op")
+                    conn.execute("RELEASE write_op")
+                    done.append((fut, None, e))
+                else:
+                    conn.execute("RELEASE write_op")
+                    done.append((fut, result, None))
+            conn.execute("COMMIT")
+        except Exception as e:
+            # ROLLBACK 마저 실패할 수 있으므로 Future 부터 실패로 끝낸다
+            for _, _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")  # 여기서 실패하면 _run 이 writer 전체를 실패 처리
+            return
+
+        for fut, result, err in done:
+            if err is not None:
+                fut.set_exception(err)
+            else:
+                fut.set_result(result)
+
+
+_writer: Optional[DBWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> DBWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None or _writer.failed:
+            # 쓰기 스레드가 죽었다면(예: DB 파일을 열 수 없었음) 다음 요청 때 새로 띄운다
+            _writer = DBWriter()
+            atexit.register(_writer.close)
+        return _writer
+
+
+def submit(op: WriteOp, *args: Any) -> Future:
+    return get_writer().submit(op, *args)
+
+
+def log_failure(description: str) -> Callable[[Future], None]:
+    """결과를 기다리지 않는 쓰기의 실패를 로그로 남기는 add_done_callback 용 콜백."""
+    def callback(fut: Future) -> None:
+        if not fut.cancelled() and fut.exception() is not None:
+            logger.error("%s 실패: %s", description, fut.exception())
+    return callback